@@ -3,247 +3,758 @@ Code analysis module for detecting language and structure.
 """
 
 import re
+import sys
 import logging
-from typing import List, Dict, Set, Optional
-from .models import FileChange, AnalyzedChange, StructuralChange
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Optional, Tuple
+from .models import DiffLine, FileChange, AnalyzedChange, StructuralChange
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Smallest diff (in files) worth the overhead of a process pool
+_PARALLEL_MIN_FILES = 16
+
+# Purpose reported when analyzing a file raised an error
+_ANALYSIS_FAILED = "Analysis failed"
+
+# Language detection mappings
+_LANGUAGE_EXTENSIONS = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.jsx': 'javascript',
+    '.tsx': 'typescript',
+    '.java': 'java',
+    '.c': 'c',
+    '.cpp': 'cpp',
+    '.cc': 'cpp',
+    '.cxx': 'cpp',
+    '.h': 'c',
+    '.hpp': 'cpp',
+    '.cs': 'csharp',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.swift': 'swift',
+    '.kt': 'kotlin',
+    '.scala': 'scala',
+    '.html': 'html',
+    '.css': 'css',
+    '.scss': 'scss',
+    '.sass': 'sass',
+    '.json': 'json',
+    '.xml': 'xml',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.md': 'markdown',
+    '.sh': 'bash',
+    '.sql': 'sql',
+    '.r': 'r',
+    '.m': 'matlab',
+    '.pl': 'perl'
+}
+
+# Special cases for common files without extensions, keyed on the lowercased base name
+_SPECIAL_FILENAMES = {
+    'makefile': 'makefile',
+    'dockerfile': 'dockerfile',
+    'package.json': 'json',
+    'tsconfig.json': 'json',
+    '.gitignore': 'config',
+    '.env': 'config',
+}
+
+
+@lru_cache(maxsize=4096)
+def _detect_language(filename: str) -> str:
+    """Detect programming language based on filename (cached per filename)."""
+    # Diff paths always use '/', so the base name is whatever follows the last one
+    basename = filename.rpartition('/')[2].lower()
+    special = _SPECIAL_FILENAMES.get(basename)
+    if special is not None:
+        return special
+    if basename.startswith('readme'):
+        return 'markdown'
+    
+    # Get file extension
+    dot = basename.rfind('.')
+    if dot == -1:
+        return 'unknown'
+    
+    return _LANGUAGE_EXTENSIONS.get(basename[dot:], 'unknown')
+
+
+# Language-specific patterns for structural elements
+_PATTERN_SOURCES = {
+    'python': {
+        'function': re.compile(r'^\s*def\s+(\w+)\s*\(([^)]*)\):'),
+        'class': re.compile(r'^\s*class\s+(\w+)(?:\([^)]*\))?:'),
+        'import': re.compile(r'^\s*(?:from\s+[\w.]+\s+)?import\s+([\w.,\s*]+)'),
+        'variable': re.compile(r'^\s*(\w+)\s*='),
+        'decorator': re.compile(r'^\s*@(\w+)')
+    },
+    'javascript': {
+        'function': re.compile(r'^\s*(?:function\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:function|\([^)]*\)\s*=>))'),
+        'class': re.compile(r'^\s*class\s+(\w+)'),
+        'import': re.compile(r'^\s*import\s+(?:{[^}]+}|\w+)\s+from\s+[\'"][^\'"]+[\'"]'),
+        'variable': re.compile(r'^\s*(?:const|let|var)\s+(\w+)\s*=\s*(?!function|\([^)]*\)\s*=>)[^;]+;?'),
+        'method': re.compile(r'^\s*(\w+)\s*\([^)]*\)\s*{')
+    },
+    'typescript': {
+        'function': re.compile(r'^\s*(?:function\s+(\w+)|(?:const|let)\s+(\w+)\s*:\s*\([^)]*\)\s*=>)'),
+        'class': re.compile(r'^\s*(?:export\s+)?class\s+(\w+)'),
+        'interface': re.compile(r'^\s*(?:export\s+)?interface\s+(\w+)'),
+        'import': re.compile(r'^\s*import\s+(?:{[^}]+}|\w+)\s+from\s+[\'"][^\'"]+[\'"]'),
+        'type': re.compile(r'^\s*(?:export\s+)?type\s+(\w+)')
+    },
+    'java': {
+        'class': re.compile(r'^\s*(?:public\s+)?class\s+(\w+)'),
+        'method': re.compile(r'^\s*(?:public|private|protected)?\s*(?:static\s+)?[\w<>]+\s+(\w+)\s*\('),
+        'import': re.compile(r'^\s*import\s+([\w.]+);'),
+        'variable': re.compile(r'^\s*(?:private|public|protected)?\s*(?:static\s+)?[\w<>]+\s+(\w+)\s*[=;]')
+    },
+    'go': {
+        'function': re.compile(r'^\s*func\s+(?:\([^)]*\)\s+)?(\w+)\s*\('),
+        'struct': re.compile(r'^\s*type\s+(\w+)\s+struct'),
+        'interface': re.compile(r'^\s*type\s+(\w+)\s+interface'),
+        'import': re.compile(r'^\s*import\s+(?:"[^"]+"|`[^`]+`)'),
+        'variable': re.compile(r'^\s*(?:var\s+)?(\w+)\s*:?=')
+    },
+    'rust': {
+        'function': re.compile(r'^\s*(?:pub\s+)?fn\s+(\w+)\s*\('),
+        'struct': re.compile(r'^\s*(?:pub\s+)?struct\s+(\w+)'),
+        'enum': re.compile(r'^\s*(?:pub\s+)?enum\s+(\w+)'),
+        'trait': re.compile(r'^\s*(?:pub\s+)?trait\s+(\w+)'),
+        'impl': re.compile(r'^\s*impl(?:\s*<[^>]*>)?\s+(?:(\w+)|(\w+)\s+for\s+(\w+))'),
+        'use': re.compile(r'^\s*use\s+([\w::{},\s*]+);')
+    }
+}
+
+# Per-language (pattern_type, compiled_pattern) tuples so hot loops iterate a
+# tuple rather than a dict.
+_LANGUAGE_PATTERNS = {
+    language: tuple(patterns.items())
+    for language, patterns in _PATTERN_SOURCES.items()
+}
+
+
+def _line_bounded(source: str) -> str:
+    """Rewrite a per-line pattern so it can never match across a newline."""
+    # Negated classes such as [^)] must not swallow line breaks
+    source = source.replace('[^', '[^\\n')
+    # A class containing \s is split into the class itself or non-newline whitespace
+    source = re.sub(r'\[([^\[\]]*?)\\s([^\[\]]*)\]', r'(?:[\1\2]|\\s)', source)
+    return source.replace('\\s', '[^\\S\\n]')
+
+
+def _fuse_patterns(patterns):
+    """Fuse a language's patterns into a single scanner.
+
+    Every pattern is wrapped in an optional lookahead following a newline, so
+    one line can still match several pattern types exactly as it would when
+    each pattern is run on its own. The trailing conditional rejects lines
+    that match none of them, so ``finditer`` only yields hits. Anchoring on a
+    literal newline (rather than ``^`` with MULTILINE) lets the engine skip
+    straight to line starts; callers scan ``'\\n' + code``.
+
+    Returns the compiled scanner and a layout tuple of
+    ``(pattern_type, group_index, inner_group_count)`` where ``group_index``
+    is the 0-based position of the pattern's outer group in ``match.groups()``.
+    """
+    parts = []
+    reject = '(?!)'
+    for pattern_type, pattern in reversed(patterns):
+        reject = f'(?({pattern_type})|{reject})'
+    for pattern_type, pattern in patterns:
+        source = _line_bounded(pattern.pattern.lstrip('^'))
+        parts.append(f'(?:(?=(?P<{pattern_type}>{source}))|)')
+    fused = re.compile('\\n' + ''.join(parts) + reject)
+    layout = tuple(
+        (pattern_type, fused.groupindex[pattern_type] - 1, pattern.groups)
+        for pattern_type, pattern in patterns
+    )
+    return fused, layout
+
+
+# One fused scanner per language, used for single-pass structure parsing.
+# The scanners rely on lookaheads and conditional groups, which DFA engines
+# such as RE2 or Hyperscan do not support, so they stay on the stdlib ``re``
+# module in keeping with the package having no runtime dependencies.
+_FUSED_PATTERNS = {
+    language: _fuse_patterns(patterns)
+    for language, patterns in _LANGUAGE_PATTERNS.items()
+}
+
+
+# Lines longer than this are skipped when collecting structural elements
+_MAX_STRUCTURAL_LINE = 2048
+
+
+def _make_structure_parser(fused, layout):
+    """Build a structure parser specialised to one language's fused scanner.
+    
+    How each pattern type names its element and whether it records function
+    parameters is resolved here once, instead of being worked out on every
+    hit from the group layout.
+    
+    Lines that declare nothing never reach Python: ``finditer`` walks them
+    inside the regex engine, so interpreted work scales with the hits.
+    """
+    pattern_types = tuple(pattern_type for pattern_type, _, _ in layout)
+    specs = []
+    for pattern_type, index, group_count in layout:
+        # Single-group patterns read the name directly; others take the first
+        # non-empty group (e.g. JavaScript functions)
+        name_index = index + 1 if group_count == 1 else None
+        params_index = index + 2 if pattern_type == 'function' and group_count > 1 else None
+        specs.append((pattern_type, index, name_index, index + 1, index + 1 + group_count, params_index))
+    specs = tuple(specs)
+    finditer = fused.finditer
+    
+    def parse(code: str) -> Dict[str, List[Dict]]:
+        # Pre-seed keys so the result keeps the per-language pattern order
+        structure = {pattern_type: [] for pattern_type in pattern_types}
+        
+        # Over-long lines are minified or generated code, not declarations.
+        # They are blanked before the scan, both to keep them out of the
+        # results and because some patterns backtrack quadratically on a
+        # long run of whitespace; blanking keeps the line numbers intact.
+        if len(code) > _MAX_STRUCTURAL_LINE:
+            lines = code.split('\n')
+            if any(len(line) > _MAX_STRUCTURAL_LINE for line in lines):
+                code = '\n'.join(['' if len(line) > _MAX_STRUCTURAL_LINE else line for line in lines])
+        
+        line_num = 1
+        counted_to = 0
+        
+        # Each hit starts at the newline before its line, which in the prefixed
+        # text is exactly the line's offset in ``code``. Hits arrive in order,
+        # so only the newlines between the previous hit's line and this one
+        # are counted: O(len(code)) overall, with no table of line offsets.
+        for match in finditer('\n' + code):
+            start = match.start()
+            line_num += code.count('\n', counted_to, start)
+            
+            end = code.find('\n', start)
+            if end == -1:
+                end = len(code)
+            counted_to = end
+            
+            content = code[start:end].strip()
+            groups = match.groups()
+            
+            for pattern_type, index, name_index, first, last, params_index in specs:
+                if groups[index] is None:
+                    continue
+                
+                if name_index is not None:
+                    name = groups[name_index] or 'anonymous'
+                else:
+                    name = next((group for group in groups[first:last] if group), 'anonymous')
+                
+                match_info = {
+                    'name': name,
+                    'line': line_num,
+                    'content': content
+                }
+                
+                # Add additional info for functions
+                if params_index is not None:
+                    match_info['parameters'] = groups[params_index] or ''
+                
+                structure[pattern_type].append(match_info)
+        
+        return {pattern_type: matches for pattern_type, matches in structure.items() if matches}
+    
+    return parse
+
+
+# Literal text a stripped Python line must start with (a tuple of prefixes)
+# and/or contain before the pattern is tried on it at all
+_PYTHON_LINE_GUARDS = {
+    'function': (('def',), None),
+    'class': (('class',), None),
+    'import': (('from', 'import'), None),
+    'variable': (None, '='),
+    'decorator': (('@',), None),
+}
+
+
+def _make_line_parser(patterns, guards):
+    """Build a structure parser that screens each line with literal guards.
+    
+    Where every pattern of a language opens with a keyword or needs a given
+    character, cheap ``startswith`` and ``in`` checks rule out nearly all
+    patterns for a line before any regex runs. A pattern that passes its
+    guard is matched exactly as before, so the results equal the fused
+    scanner's.
+    """
+    pattern_types = tuple(pattern_type for pattern_type, _ in patterns)
+    specs = tuple(
+        (pattern_type, pattern.match, *guards.get(pattern_type, (None, None)),
+         pattern.groups == 1, pattern_type == 'function' and pattern.groups > 1)
+        for pattern_type, pattern in patterns
+    )
+    
+    def parse(code: str) -> Dict[str, List[Dict]]:
+        # Pre-seed keys so the result keeps the per-language pattern order
+        structure = {pattern_type: [] for pattern_type in pattern_types}
+        
+        for line_num, line in enumerate(code.split('\n'), 1):
+            # Over-long lines are minified or generated code, not declarations
+            if len(line) > _MAX_STRUCTURAL_LINE:
+                continue
+            
+            content = line.strip()
+            if not content:
+                continue
+            
+            for pattern_type, match, prefixes, needle, single_group, has_params in specs:
+                if prefixes is not None and not content.startswith(prefixes):
+                    continue
+                if needle is not None and needle not in content:
+                    continue
+                
+                found = match(line)
+                if found is None:
+                    continue
+                
+                if single_group:
+                    name = found.group(1) or 'anonymous'
+                else:
+                    name = next((group for group in found.groups() if group), 'anonymous')
+                
+                match_info = {
+                    'name': name,
+                    'line': line_num,
+                    'content': content
+                }
+                
+                # Add additional info for functions
+                if has_params:
+                    match_info['parameters'] = found.group(2) or ''
+                
+                structure[pattern_type].append(match_info)
+        
+        return {pattern_type: matches for pattern_type, matches in structure.items() if matches}
+    
+    return parse
+
+
+# Per-language structure parsers built on the fused scanners, except Python,
+# whose patterns all have literal guards that are cheaper to test per line
+_STRUCTURE_PARSERS = {
+    language: _make_structure_parser(fused, layout)
+    for language, (fused, layout) in _FUSED_PATTERNS.items()
+}
+_STRUCTURE_PARSERS['python'] = _make_line_parser(_LANGUAGE_PATTERNS['python'], _PYTHON_LINE_GUARDS)
+
+
+# Changes smaller than this (in characters) are parsed together with the
+# other small changes in the same language, in a single scanner pass
+_BATCH_MAX_CODE = 4096
+
+
+def _parse_batch(parser, codes: List[str]) -> List[Dict[str, List[Dict]]]:
+    """Parse several snippets of one language in a single scanner pass.
+    
+    The snippets are joined by newlines and scanned once. Every pattern is
+    bounded to a single line, so no match can span two snippets; each hit is
+    mapped back to its snippet by line number, and its line number made
+    relative to that snippet again. The results equal parsing each snippet
+    on its own.
+    """
+    # First line of each snippet in the joined text
+    starts = []
+    line = 1
+    for code in codes:
+        starts.append(line)
+        line += code.count('\n') + 1
+    
+    results = [{} for _ in codes]
+    for element_type, elements in parser('\n'.join(codes)).items():
+        # Elements arrive in line order, so each snippet's list for this
+        # type is created once, when the first of its elements shows up
+        current = -1
+        for element in elements:
+            index = bisect_right(starts, element['line']) - 1
+            if index != current:
+                current = index
+                bucket = results[index][element_type] = []
+            element['line'] -= starts[index] - 1
+            bucket.append(element)
+    
+    return results
+
+
+@lru_cache(maxsize=None)
+def _change_type(element_type: str, action: str) -> str:
+    """Return the shared, interned '<element_type>_<action>' change type string."""
+    return sys.intern(f'{element_type}_{action}')
+
+
+def _changed_code(file_change: FileChange) -> Tuple[str, str]:
+    """Return the added and removed lines of a file change, each joined by newlines."""
+    added_lines = []
+    removed_lines = []
+    added = DiffLine.ADDED
+    removed = DiffLine.REMOVED
+    
+    for hunk in file_change.hunks:
+        for line in hunk.lines:
+            line_type = line.line_type
+            if line_type == added:
+                added_lines.append(line.content)
+            elif line_type == removed:
+                removed_lines.append(line.content)
+    
+    return '\n'.join(added_lines), '\n'.join(removed_lines)
+
+
+def _analysis_key(file_change: FileChange, max_file_size: Optional[int]) -> Optional[Tuple]:
+    """Return a key covering everything a file's analysis depends on.
+    
+    Changes without a filename are never analyzed and get no key.
+    """
+    if not file_change.filename:
+        return None
+    return (
+        file_change.filename,
+        file_change.change_type,
+        file_change.lines_added,
+        file_change.lines_removed,
+        max_file_size,
+        len(file_change.hunks),
+        tuple(chain.from_iterable((line.line_type, line.content)
+                                  for hunk in file_change.hunks for line in hunk.lines)),
+    )
+
+
+def _named_elements(elements: List[Dict]) -> Dict[str, None]:
+    """Return the names of parsed elements in first-seen order, ignoring unnamed matches.
+    
+    The result is a dict used as an ordered set: membership tests are O(1)
+    and iterating it follows the order the elements appeared in the code.
+    """
+    return dict.fromkeys(element['name'] for element in elements if element['name'] != 'anonymous')
+
+
+# File kinds by extension for impact assessment; test files are recognised
+# by their full suffix among core files
+_IMPACT_EXTENSIONS = {
+    '.py': 'core', '.js': 'core', '.ts': 'core', '.java': 'core',
+    '.json': 'config', '.yaml': 'config', '.yml': 'config', '.xml': 'config',
+    '.md': 'doc', '.txt': 'doc', '.rst': 'doc',
+}
+_TEST_SUFFIXES = ('.test.py', '.spec.js', '.test.ts')
+_FILE_KIND_IMPACTS = {
+    'core': "Core application code - runtime impact",
+    'test': "Test code - affects test coverage",
+    'config': "Configuration changes - may affect deployment",
+    'doc': "Documentation changes - no runtime impact",
+}
+
+
+# Complexity scoring tables
+_COMPLEX_CHANGE_TYPES = frozenset({'class_added', 'class_modified', 'interface_added', 'interface_modified'})
+# More complex languages add a point, data/doc formats take one away
+_LANGUAGE_COMPLEXITY = {'cpp': 1, 'rust': 1, 'java': 1, 'json': -1, 'yaml': -1, 'markdown': -1}
+# Renames can be tricky, deletions can break things
+_CHANGE_TYPE_COMPLEXITY = {'renamed': 1, 'deleted': 2}
+
+
+def _complexity_core(total_lines: int, structural_count: int, complex_count: int,
+                     modification_count: int, language_weight: int, change_weight: int) -> int:
+    """Score a change on a 0-10 scale from pre-counted integers."""
+    score = 0
+    
+    # Base score from lines changed
+    if total_lines > 200:
+        score += 4
+    elif total_lines > 100:
+        score += 3
+    elif total_lines > 50:
+        score += 2
+    elif total_lines > 10:
+        score += 1
+    
+    # Structural complexity
+    score += min(structural_count, 3)
+    if complex_count:
+        score += 2
+    score += min(modification_count, 2)
+    
+    # File type complexity
+    score = max(0, score + language_weight)
+    
+    # File change type complexity
+    score += change_weight
+    
+    # Cap the score at 10
+    return min(score, 10)
+
+# Keyword groups looked for in changed content. Plain substring tests are
+# kept on purpose: str.__contains__ runs CPython's fast search in C and beats
+# a fused regex alternation over the same text by a wide margin.
+_DEBT_KEYWORDS = ('todo', 'fixme', 'hack')
+_DOC_KEYWORDS = ('"""', "'''", '//', '/*', '#')
+_ADDED_CONTENT_PURPOSES = (
+    (('test', 'spec', 'assert', 'expect'), "Test coverage improvement"),
+    (('log', 'debug', 'print', 'console'), "Debugging or logging enhancement"),
+    (('error', 'exception', 'try', 'catch'), "Error handling improvement"),
+    (_DEBT_KEYWORDS, "Technical debt or temporary fix"),
+)
+
 
 class CodeAnalyzer:
     """Analyzes code structure and infers change meanings."""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 1, max_file_size: Optional[int] = None, cache_size: int = 0):
         # Language detection mappings
-        self.language_extensions = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.jsx': 'javascript',
-            '.tsx': 'typescript',
-            '.java': 'java',
-            '.c': 'c',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp',
-            '.h': 'c',
-            '.hpp': 'cpp',
-            '.cs': 'csharp',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.swift': 'swift',
-            '.kt': 'kotlin',
-            '.scala': 'scala',
-            '.html': 'html',
-            '.css': 'css',
-            '.scss': 'scss',
-            '.sass': 'sass',
-            '.json': 'json',
-            '.xml': 'xml',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-            '.md': 'markdown',
-            '.sh': 'bash',
-            '.sql': 'sql',
-            '.r': 'r',
-            '.m': 'matlab',
-            '.pl': 'perl'
-        }
-        
-        # Language-specific patterns for structural elements
-        self.language_patterns = {
-            'python': {
-                'function': re.compile(r'^\s*def\s+(\w+)\s*\(([^)]*)\):'),
-                'class': re.compile(r'^\s*class\s+(\w+)(?:\([^)]*\))?:'),
-                'import': re.compile(r'^\s*(?:from\s+[\w.]+\s+)?import\s+([\w.,\s*]+)'),
-                'variable': re.compile(r'^\s*(\w+)\s*='),
-                'decorator': re.compile(r'^\s*@(\w+)')
-            },
-            'javascript': {
-                'function': re.compile(r'^\s*(?:function\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:function|\([^)]*\)\s*=>))'),
-                'class': re.compile(r'^\s*class\s+(\w+)'),
-                'import': re.compile(r'^\s*import\s+(?:{[^}]+}|\w+)\s+from\s+[\'"][^\'"]+[\'"]'),
-                'variable': re.compile(r'^\s*(?:const|let|var)\s+(\w+)\s*=\s*(?!function|\([^)]*\)\s*=>)[^;]+;?'),
-                'method': re.compile(r'^\s*(\w+)\s*\([^)]*\)\s*{')
-            },
-            'typescript': {
-                'function': re.compile(r'^\s*(?:function\s+(\w+)|(?:const|let)\s+(\w+)\s*:\s*\([^)]*\)\s*=>)'),
-                'class': re.compile(r'^\s*(?:export\s+)?class\s+(\w+)'),
-                'interface': re.compile(r'^\s*(?:export\s+)?interface\s+(\w+)'),
-                'import': re.compile(r'^\s*import\s+(?:{[^}]+}|\w+)\s+from\s+[\'"][^\'"]+[\'"]'),
-                'type': re.compile(r'^\s*(?:export\s+)?type\s+(\w+)')
-            },
-            'java': {
-                'class': re.compile(r'^\s*(?:public\s+)?class\s+(\w+)'),
-                'method': re.compile(r'^\s*(?:public|private|protected)?\s*(?:static\s+)?[\w<>]+\s+(\w+)\s*\('),
-                'import': re.compile(r'^\s*import\s+([\w.]+);'),
-                'variable': re.compile(r'^\s*(?:private|public|protected)?\s*(?:static\s+)?[\w<>]+\s+(\w+)\s*[=;]')
-            },
-            'go': {
-                'function': re.compile(r'^\s*func\s+(?:\([^)]*\)\s+)?(\w+)\s*\('),
-                'struct': re.compile(r'^\s*type\s+(\w+)\s+struct'),
-                'interface': re.compile(r'^\s*type\s+(\w+)\s+interface'),
-                'import': re.compile(r'^\s*import\s+(?:"[^"]+"|`[^`]+`)'),
-                'variable': re.compile(r'^\s*(?:var\s+)?(\w+)\s*:?=')
-            },
-            'rust': {
-                'function': re.compile(r'^\s*(?:pub\s+)?fn\s+(\w+)\s*\('),
-                'struct': re.compile(r'^\s*(?:pub\s+)?struct\s+(\w+)'),
-                'enum': re.compile(r'^\s*(?:pub\s+)?enum\s+(\w+)'),
-                'trait': re.compile(r'^\s*(?:pub\s+)?trait\s+(\w+)'),
-                'impl': re.compile(r'^\s*impl(?:\s*<[^>]*>)?\s+(?:(\w+)|(\w+)\s+for\s+(\w+))'),
-                'use': re.compile(r'^\s*use\s+([\w::{},\s*]+);')
-            }
-        }
+        self.language_extensions = _LANGUAGE_EXTENSIONS
+        
+        # Language-specific patterns, compiled once at import time
+        self.language_patterns = _LANGUAGE_PATTERNS
+        
+        # Number of worker processes for large diffs (1 = analyze serially)
+        self.max_workers = max_workers
+        
+        # Changed code (in characters) above which structural parsing is skipped
+        self.max_file_size = max_file_size
+        
+        # Analyses of unchanged files kept for re-runs (0 = no caching)
+        self.cache_size = cache_size
+        self._analysis_cache = {}
     
     def analyze_changes(self, file_changes: List[FileChange]) -> List[AnalyzedChange]:
-        """Analyze file changes and return analyzed changes with context."""
+        """Analyze file changes and return analyzed changes with context.
+        
+        When ``max_workers`` is greater than 1 and the diff touches at least
+        ``_PARALLEL_MIN_FILES`` files, files are analyzed in a process pool.
+        The returned changes then hold copies of the input ``FileChange``
+        objects rather than the originals.
+        
+        With a ``cache_size`` above 0, files whose name, change type and
+        changed lines match an earlier call are answered from the cache.
+        """
         if not file_changes:
             logger.debug("No file changes provided for analysis")
             return []
         
-        analyzed_changes = []
+        if not self.cache_size:
+            results = self._analyze_uncached(file_changes)
+        else:
+            results = self._analyze_cached(file_changes)
         
-        for file_change in file_changes:
-            try:
-                # Validate file change
-                if not file_change.filename:
-                    logger.warning("File change has no filename, skipping")
-                    continue
-                
-                # Detect language for the file
-                language = self.detect_language(file_change.filename)
-                file_change.language = language
-                logger.debug(f"Detected language '{language}' for file '{file_change.filename}'")
-                
-                # Analyze structural changes
-                structural_changes = self._analyze_structural_changes(file_change, language)
-                
-                # Infer purpose and assess impact
-                purpose_inference = self._infer_change_purpose(file_change, structural_changes)
-                impact_assessment = self._assess_change_impact(file_change, structural_changes)
-                complexity_score = self._calculate_complexity_score(file_change, structural_changes)
-                
-                # Create analyzed change
-                analyzed_change = AnalyzedChange(
-                    file_change=file_change,
-                    structural_changes=structural_changes,
-                    purpose_inference=purpose_inference,
-                    impact_assessment=impact_assessment,
-                    complexity_score=complexity_score
-                )
-                
-                analyzed_changes.append(analyzed_change)
-                
-            except Exception as e:
-                logger.error(f"Error analyzing file change '{file_change.filename}': {e}")
-                # Create a minimal analyzed change to avoid breaking the pipeline
-                analyzed_change = AnalyzedChange(
-                    file_change=file_change,
-                    structural_changes=[],
-                    purpose_inference="Analysis failed",
-                    impact_assessment="Unable to assess impact",
-                    complexity_score=0
-                )
-                analyzed_changes.append(analyzed_change)
+        analyzed_changes = [change for change in results if change is not None]
         
-        logger.debug(f"Successfully analyzed {len(analyzed_changes)} file changes")
+        logger.debug("Successfully analyzed %s file changes", len(analyzed_changes))
         return analyzed_changes
     
+    def _analyze_uncached(self, file_changes: List[FileChange]) -> List[Optional[AnalyzedChange]]:
+        """Analyze every file change, in a process pool for large diffs."""
+        if self.max_workers > 1 and len(file_changes) >= _PARALLEL_MIN_FILES:
+            chunksize = max(1, len(file_changes) // (4 * self.max_workers))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(self._analyze_single, file_changes, chunksize=chunksize))
+        
+        prepared = self._prepare_changes(file_changes)
+        return [
+            self._analyze_single(file_change, changes)
+            for file_change, changes in zip(file_changes, prepared)
+        ]
+    
+    def _analyze_cached(self, file_changes: List[FileChange]) -> List[Optional[AnalyzedChange]]:
+        """Analyze file changes, reusing and recording cached analyses."""
+        cache = self._analysis_cache
+        results = [None] * len(file_changes)
+        missing = []
+        
+        for position, file_change in enumerate(file_changes):
+            key = _analysis_key(file_change, self.max_file_size)
+            cached = cache.get(key) if key is not None else None
+            if cached is None:
+                missing.append((position, key))
+                continue
+            
+            language, structural_changes, purpose_inference, impact_assessment, complexity_score = cached
+            file_change.language = language
+            results[position] = AnalyzedChange(
+                file_change=file_change,
+                structural_changes=list(structural_changes),
+                purpose_inference=purpose_inference,
+                impact_assessment=impact_assessment,
+                complexity_score=complexity_score
+            )
+        
+        logger.debug("Reusing cached analysis for %s of %s file changes",
+                     len(file_changes) - len(missing), len(file_changes))
+        if not missing:
+            return results
+        
+        analyzed = self._analyze_uncached([file_changes[position] for position, _ in missing])
+        for (position, key), change in zip(missing, analyzed):
+            results[position] = change
+            # Failed analyses are not kept, so a later run can succeed
+            if key is None or change is None or change.purpose_inference == _ANALYSIS_FAILED:
+                continue
+            if len(cache) >= self.cache_size:
+                # Evict the oldest entry; dicts keep insertion order
+                del cache[next(iter(cache))]
+            cache[key] = (change.file_change.language, tuple(change.structural_changes),
+                          change.purpose_inference, change.impact_assessment, change.complexity_score)
+        
+        return results
+    
+    def clear_cache(self):
+        """Forget all cached analyses."""
+        self._analysis_cache.clear()
+    
+    def _prepare_changes(self, file_changes: List[FileChange]) -> List[Optional[Tuple]]:
+        """Collect changed code per file and parse small changes in batches.
+        
+        Returns, for each file change, ``None`` if it is left entirely to
+        ``_analyze_single`` or an ``(added_code, removed_code, structures)``
+        tuple, where ``structures`` holds the parsed added and removed
+        structure, or ``None`` if the change is too large to batch.
+        """
+        prepared = [None] * len(file_changes)
+        batches = {}
+        
+        for position, file_change in enumerate(file_changes):
+            if not file_change.filename or not file_change.hunks:
+                continue
+            try:
+                language = self.detect_language(file_change.filename)
+            except Exception:
+                # Reported by _analyze_single
+                continue
+            if language not in _STRUCTURE_PARSERS:
+                continue
+            
+            added_code, removed_code = _changed_code(file_change)
+            prepared[position] = (added_code, removed_code, None)
+            if len(added_code) + len(removed_code) <= _BATCH_MAX_CODE:
+                batches.setdefault(language, []).append(position)
+        
+        # One scanner pass per language over all of its small changes
+        for language, positions in batches.items():
+            parser = _STRUCTURE_PARSERS[language]
+            added = _parse_batch(parser, [prepared[position][0] for position in positions])
+            removed = _parse_batch(parser, [prepared[position][1] for position in positions])
+            for position, added_structure, removed_structure in zip(positions, added, removed):
+                added_code, removed_code, _ = prepared[position]
+                prepared[position] = (added_code, removed_code, (added_structure, removed_structure))
+        
+        return prepared
+    
+    def _analyze_single(self, file_change: FileChange, prepared: Optional[Tuple] = None) -> Optional[AnalyzedChange]:
+        """Analyze one file change, or return None if it has to be skipped.
+        
+        ``prepared`` optionally carries the changed code and parsed structure
+        collected by ``_prepare_changes``.
+        """
+        try:
+            # Validate file change
+            if not file_change.filename:
+                logger.warning("File change has no filename, skipping")
+                return None
+            
+            # Detect language for the file
+            language = self.detect_language(file_change.filename)
+            file_change.language = language
+            logger.debug("Detected language '%s' for file '%s'", language, file_change.filename)
+            
+            # Collect changed code once; both structure parsing and purpose inference use it
+            if prepared is not None:
+                added_code, removed_code, structures = prepared
+            else:
+                added_code, removed_code = _changed_code(file_change)
+                structures = None
+            
+            # Analyze structural changes
+            structural_changes = self._analyze_structural_changes(file_change, language, added_code, removed_code,
+                                                                  structures)
+            
+            # Infer purpose and assess impact
+            purpose_inference = self._infer_change_purpose(file_change, structural_changes, added_code, removed_code)
+            impact_assessment = self._assess_change_impact(file_change, structural_changes)
+            complexity_score = self._calculate_complexity_score(file_change, structural_changes)
+            
+            # Create analyzed change
+            return AnalyzedChange(
+                file_change=file_change,
+                structural_changes=structural_changes,
+                purpose_inference=purpose_inference,
+                impact_assessment=impact_assessment,
+                complexity_score=complexity_score
+            )
+            
+        except Exception as e:
+            logger.error("Error analyzing file change '%s': %s", file_change.filename, e)
+            # Create a minimal analyzed change to avoid breaking the pipeline
+            return AnalyzedChange(
+                file_change=file_change,
+                structural_changes=[],
+                purpose_inference=_ANALYSIS_FAILED,
+                impact_assessment="Unable to assess impact",
+                complexity_score=0
+            )
+    
     def detect_language(self, filename: str) -> str:
         """Detect programming language based on filename."""
-        # Special cases for common files without extensions
-        filename_lower = filename.lower()
-        if filename_lower in ['makefile', 'dockerfile']:
-            return filename_lower
-        elif filename_lower.startswith('readme'):
-            return 'markdown'
-        elif filename_lower in ['package.json', 'tsconfig.json']:
-            return 'json'
-        elif filename_lower in ['.gitignore', '.env']:
-            return 'config'
-        
-        # Get file extension
-        if '.' not in filename:
-            return 'unknown'
-        
-        extension = '.' + filename.split('.')[-1].lower()
-        
-        # Check direct extension mapping
-        if extension in self.language_extensions:
-            return self.language_extensions[extension]
-        
-        return 'unknown'
+        return _detect_language(filename)
     
     def parse_code_structure(self, code: str, language: str) -> Dict[str, List[Dict]]:
         """Parse code structure for the given language."""
-        if language not in self.language_patterns:
+        parser = _STRUCTURE_PARSERS.get(language)
+        if parser is None:
             return {}
         
-        patterns = self.language_patterns[language]
-        structure = {}
-        
-        lines = code.split('\n')
-        
-        for pattern_type, pattern in patterns.items():
-            matches = []
-            for line_num, line in enumerate(lines, 1):
-                match = pattern.match(line)
-                if match:
-                    # Handle multiple capture groups (e.g., JavaScript functions)
-                    name = 'anonymous'
-                    for i in range(1, len(match.groups()) + 1):
-                        if match.group(i):
-                            name = match.group(i)
-                            break
-                    
-                    match_info = {
-                        'name': name,
-                        'line': line_num,
-                        'content': line.strip()
-                    }
-                    
-                    # Add additional info for functions
-                    if pattern_type == 'function' and len(match.groups()) > 1:
-                        match_info['parameters'] = match.group(2) if match.group(2) else ''
-                    
-                    matches.append(match_info)
-            
-            if matches:
-                structure[pattern_type] = matches
-        
-        return structure
+        return parser(code)
     
-    def _analyze_structural_changes(self, file_change: FileChange, language: str) -> List[StructuralChange]:
-        """Analyze structural changes in a file."""
+    def _analyze_structural_changes(self, file_change: FileChange, language: str,
+                                    added_code: str, removed_code: str,
+                                    structures: Optional[Tuple[Dict, Dict]] = None) -> List[StructuralChange]:
+        """Analyze structural changes in a file from its added and removed code.
+        
+        ``structures`` may hold the already parsed added and removed structure,
+        in which case the code is not scanned again.
+        """
         structural_changes = []
         
-        if language == 'unknown' or not file_change.hunks:
+        # Only languages with structure patterns are worth scanning
+        if language not in _STRUCTURE_PARSERS or not file_change.hunks:
             return structural_changes
         
-        # Collect added and removed lines
-        added_lines = []
-        removed_lines = []
+        if self.max_file_size and len(added_code) + len(removed_code) > self.max_file_size:
+            logger.debug("Skipping structural analysis of '%s': changes exceed %s characters",
+                         file_change.filename, self.max_file_size)
+            return structural_changes
         
-        for hunk in file_change.hunks:
-            for line in hunk.lines:
-                if line.line_type == '+':
-                    added_lines.append(line.content)
-                elif line.line_type == '-':
-                    removed_lines.append(line.content)
+        # Names seen per element type, reused for modification detection
+        added_by_type = {}
+        removed_by_type = {}
+        
+        if structures is not None:
+            added_structure, removed_structure = structures
+        else:
+            added_structure = self.parse_code_structure(added_code, language) if added_code else {}
+            removed_structure = self.parse_code_structure(removed_code, language) if removed_code else {}
         
         # Analyze added code
-        if added_lines:
-            added_code = '\n'.join(added_lines)
-            added_structure = self.parse_code_structure(added_code, language)
+        if added_structure:
             
             for element_type, elements in added_structure.items():
+                added_by_type[element_type] = _named_elements(elements)
                 for element in elements:
                     structural_change = StructuralChange(
-                        change_type=f'{element_type}_added',
+                        change_type=_change_type(element_type, 'added'),
                         element_name=element['name'],
                         description=f"Added {element_type} '{element['name']}'",
                         after=element['content']
@@ -251,14 +762,12 @@ class CodeAnalyzer:
                     structural_changes.append(structural_change)
         
         # Analyze removed code
-        if removed_lines:
-            removed_code = '\n'.join(removed_lines)
-            removed_structure = self.parse_code_structure(removed_code, language)
-            
+        if removed_structure:
             for element_type, elements in removed_structure.items():
+                removed_by_type[element_type] = _named_elements(elements)
                 for element in elements:
                     structural_change = StructuralChange(
-                        change_type=f'{element_type}_removed',
+                        change_type=_change_type(element_type, 'removed'),
                         element_name=element['name'],
                         description=f"Removed {element_type} '{element['name']}'",
                         before=element['content']
@@ -266,52 +775,49 @@ class CodeAnalyzer:
                     structural_changes.append(structural_change)
         
         # Detect modifications (simplified - could be enhanced)
-        self._detect_modifications(structural_changes, added_lines, removed_lines, language)
+        self._detect_modifications(structural_changes, added_by_type, removed_by_type)
         
         return structural_changes
     
-    def _detect_modifications(self, structural_changes: List[StructuralChange], 
-                            added_lines: List[str], removed_lines: List[str], language: str):
-        """Detect modifications by comparing added and removed lines."""
-        if language not in self.language_patterns:
-            return
-        
-        patterns = self.language_patterns[language]
-        
+    def _detect_modifications(self, structural_changes: List[StructuralChange],
+                            added_by_type: Dict[str, Dict[str, None]],
+                            removed_by_type: Dict[str, Dict[str, None]]):
+        """Detect modifications by comparing names parsed from added and removed code."""
         # Simple heuristic: if we have similar function/class names in both added and removed,
         # it might be a modification
-        for pattern_type, pattern in patterns.items():
-            added_names = set()
-            removed_names = set()
-            
-            for line in added_lines:
-                match = pattern.match(line)
-                if match and match.group(1):
-                    added_names.add(match.group(1))
-            
-            for line in removed_lines:
-                match = pattern.match(line)
-                if match and match.group(1):
-                    removed_names.add(match.group(1))
-            
-            # Find common names (potential modifications)
-            common_names = added_names.intersection(removed_names)
+        superseded = set()
+        modifications = []
+        
+        for pattern_type, added_names in added_by_type.items():
+            removed_names = removed_by_type.get(pattern_type)
+            if not removed_names:
+                continue
             
-            for name in common_names:
-                # Remove the individual add/remove entries for this name
-                structural_changes[:] = [sc for sc in structural_changes 
-                                       if not (sc.element_name == name and 
-                                             sc.change_type in [f'{pattern_type}_added', f'{pattern_type}_removed'])]
+            # Find common names (potential modifications), in the order they were added
+            for name in added_names:
+                if name not in removed_names:
+                    continue
+                
+                # The individual add/remove entries for this name are dropped below
+                superseded.add((_change_type(pattern_type, 'added'), name))
+                superseded.add((_change_type(pattern_type, 'removed'), name))
                 
                 # Add modification entry
                 structural_change = StructuralChange(
-                    change_type=f'{pattern_type}_modified',
+                    change_type=_change_type(pattern_type, 'modified'),
                     element_name=name,
                     description=f"Modified {pattern_type} '{name}'"
                 )
-                structural_changes.append(structural_change)    
+                modifications.append(structural_change)
+        
+        # Drop superseded add/remove entries in a single pass
+        if superseded:
+            structural_changes[:] = [sc for sc in structural_changes
+                                     if (sc.change_type, sc.element_name) not in superseded]
+        structural_changes.extend(modifications)
 
-    def _infer_change_purpose(self, file_change: FileChange, structural_changes: List[StructuralChange]) -> str:
+    def _infer_change_purpose(self, file_change: FileChange, structural_changes: List[StructuralChange],
+                              added_code: str, removed_code: str) -> str:
         """Infer the purpose of changes based on patterns and context."""
         purposes = []
         
@@ -325,12 +831,13 @@ class CodeAnalyzer:
         
         # Analyze structural changes
         if structural_changes:
-            change_types = [sc.change_type for sc in structural_changes]
+            # Change types are exact '<type>_<action>' strings, so set lookups suffice
+            change_types = {sc.change_type for sc in structural_changes}
             
             # Function-related changes
-            function_added = any('function_added' in ct for ct in change_types)
-            function_removed = any('function_removed' in ct for ct in change_types)
-            function_modified = any('function_modified' in ct for ct in change_types)
+            function_added = 'function_added' in change_types
+            function_removed = 'function_removed' in change_types
+            function_modified = 'function_modified' in change_types
             
             if function_added and not function_removed:
                 purposes.append("Feature addition")
@@ -340,9 +847,9 @@ class CodeAnalyzer:
                 purposes.append("Bug fix or enhancement")
             
             # Class-related changes
-            class_added = any('class_added' in ct for ct in change_types)
-            class_removed = any('class_removed' in ct for ct in change_types)
-            class_modified = any('class_modified' in ct for ct in change_types)
+            class_added = 'class_added' in change_types
+            class_removed = 'class_removed' in change_types
+            class_modified = 'class_modified' in change_types
             
             if class_added:
                 purposes.append("New component or module")
@@ -352,8 +859,8 @@ class CodeAnalyzer:
                 purposes.append("Class enhancement")
             
             # Import changes
-            import_added = any('import_added' in ct for ct in change_types)
-            import_removed = any('import_removed' in ct for ct in change_types)
+            import_added = 'import_added' in change_types
+            import_removed = 'import_removed' in change_types
             
             if import_added:
                 purposes.append("Dependency addition")
@@ -361,40 +868,22 @@ class CodeAnalyzer:
                 purposes.append("Dependency cleanup")
         
         # Analyze content patterns for additional context
-        all_added_content = []
-        all_removed_content = []
-        
-        for hunk in file_change.hunks:
-            for line in hunk.lines:
-                if line.line_type == '+':
-                    all_added_content.append(line.content.lower())
-                elif line.line_type == '-':
-                    all_removed_content.append(line.content.lower())
-        
-        added_text = ' '.join(all_added_content)
-        removed_text = ' '.join(all_removed_content)
+        added_text = added_code.lower()
+        removed_text = removed_code.lower()
         
         # Look for common patterns
-        if any(keyword in added_text for keyword in ['test', 'spec', 'assert', 'expect']):
-            purposes.append("Test coverage improvement")
+        for keywords, purpose in _ADDED_CONTENT_PURPOSES:
+            if any(keyword in added_text for keyword in keywords):
+                purposes.append(purpose)
         
-        if any(keyword in added_text for keyword in ['log', 'debug', 'print', 'console']):
-            purposes.append("Debugging or logging enhancement")
-        
-        if any(keyword in added_text for keyword in ['error', 'exception', 'try', 'catch']):
-            purposes.append("Error handling improvement")
-        
-        if any(keyword in added_text for keyword in ['todo', 'fixme', 'hack']):
-            purposes.append("Technical debt or temporary fix")
-        
-        if any(keyword in removed_text for keyword in ['todo', 'fixme', 'hack']):
+        if any(keyword in removed_text for keyword in _DEBT_KEYWORDS):
             purposes.append("Technical debt resolution")
         
         # Documentation changes
         if file_change.language in ['markdown', 'unknown'] and 'readme' in file_change.filename.lower():
             purposes.append("Documentation update")
         
-        if any(keyword in added_text for keyword in ['"""', "'''", '//', '/*', '#']):
+        if any(keyword in added_text for keyword in _DOC_KEYWORDS):
             purposes.append("Documentation improvement")
         
         return "; ".join(purposes) if purposes else "Code modification"
@@ -422,83 +911,60 @@ class CodeAnalyzer:
         
         # Structural impact
         if structural_changes:
-            public_changes = []
-            private_changes = []
+            # One pass counts private elements and spots class and import changes
+            private_count = 0
+            has_class_changes = False
+            has_import_changes = False
             
             for sc in structural_changes:
-                # Heuristic: assume functions/classes starting with _ are private
-                if sc.element_name.startswith('_'):
-                    private_changes.append(sc)
-                else:
-                    public_changes.append(sc)
+                # Heuristic: functions/classes starting with _ are private
+                if sc.is_private:
+                    private_count += 1
+                change_type = sc.change_type
+                if not has_class_changes and 'class' in change_type:
+                    has_class_changes = True
+                if not has_import_changes and 'import' in change_type:
+                    has_import_changes = True
             
-            if public_changes:
-                impact_factors.append(f"Public API changes ({len(public_changes)} elements) - may affect external code")
+            public_count = len(structural_changes) - private_count
+            if public_count:
+                impact_factors.append(f"Public API changes ({public_count} elements) - may affect external code")
             
-            if private_changes:
-                impact_factors.append(f"Internal implementation changes ({len(private_changes)} elements)")
+            if private_count:
+                impact_factors.append(f"Internal implementation changes ({private_count} elements)")
             
             # Specific structural impacts
-            if any('class' in sc.change_type for sc in structural_changes):
+            if has_class_changes:
                 impact_factors.append("Class structure changes - may affect inheritance")
             
-            if any('import' in sc.change_type for sc in structural_changes):
+            if has_import_changes:
                 impact_factors.append("Dependency changes - may affect build process")
         
         # File type specific impacts
-        if file_change.filename.endswith(('.py', '.js', '.ts', '.java')):
-            impact_factors.append("Core application code - runtime impact")
-        elif file_change.filename.endswith(('.test.py', '.spec.js', '.test.ts')):
-            impact_factors.append("Test code - affects test coverage")
-        elif file_change.filename.endswith(('.json', '.yaml', '.yml', '.xml')):
-            impact_factors.append("Configuration changes - may affect deployment")
-        elif file_change.filename.endswith(('.md', '.txt', '.rst')):
-            impact_factors.append("Documentation changes - no runtime impact")
+        filename = file_change.filename
+        file_kind = _IMPACT_EXTENSIONS.get(filename[filename.rfind('.'):])
+        if file_kind == 'core' and filename.endswith(_TEST_SUFFIXES):
+            file_kind = 'test'
+        if file_kind:
+            impact_factors.append(_FILE_KIND_IMPACTS[file_kind])
         
         return "; ".join(impact_factors) if impact_factors else "Minimal impact expected"
     
     def _calculate_complexity_score(self, file_change: FileChange, structural_changes: List[StructuralChange]) -> int:
         """Calculate a complexity score for the changes (0-10 scale)."""
-        score = 0
-        
-        # Base score from lines changed
-        total_lines = file_change.lines_added + file_change.lines_removed
-        if total_lines > 200:
-            score += 4
-        elif total_lines > 100:
-            score += 3
-        elif total_lines > 50:
-            score += 2
-        elif total_lines > 10:
-            score += 1
-        
-        # Structural complexity
-        if structural_changes:
-            # More points for more structural changes
-            score += min(len(structural_changes), 3)
-            
-            # Extra points for complex change types
-            complex_changes = ['class_added', 'class_modified', 'interface_added', 'interface_modified']
-            if any(sc.change_type in complex_changes for sc in structural_changes):
-                score += 2
-            
-            # Points for modifications (more complex than additions/removals)
-            modifications = [sc for sc in structural_changes if 'modified' in sc.change_type]
-            score += min(len(modifications), 2)
-        
-        # File type complexity
-        if file_change.language in ['cpp', 'rust', 'java']:
-            score += 1  # More complex languages
-        elif file_change.language in ['python', 'javascript', 'typescript']:
-            pass  # Neutral
-        elif file_change.language in ['json', 'yaml', 'markdown']:
-            score = max(0, score - 1)  # Less complex
-        
-        # File change type complexity
-        if file_change.change_type == 'renamed':
-            score += 1  # Renames can be tricky
-        elif file_change.change_type == 'deleted':
-            score += 2  # Deletions can break things
-        
-        # Cap the score at 10
-        return min(score, 10)
\ No newline at end of file
+        complex_changes = 0
+        modifications = 0
+        for sc in structural_changes:
+            if sc.change_type in _COMPLEX_CHANGE_TYPES:
+                complex_changes += 1
+            if 'modified' in sc.change_type:
+                modifications += 1
+        
+        return _complexity_core(
+            file_change.lines_added + file_change.lines_removed,
+            len(structural_changes),
+            complex_changes,
+            modifications,
+            _LANGUAGE_COMPLEXITY.get(file_change.language, 0),
+            _CHANGE_TYPE_COMPLEXITY.get(file_change.change_type, 0)
+        )
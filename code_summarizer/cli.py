@@ -3,19 +3,66 @@ Command-line interface for the code change summarizer.
 """
 
 import argparse
+import io
 import sys
 import os
+from functools import lru_cache
 from typing import Optional
 
-from .parser import DiffParser
-from .analyzer import CodeAnalyzer
-from .generator import SummaryGenerator
-from .formatter import OutputFormatter
-from .config import config
+# The parser, analyzer, generator and formatter modules are imported where
+# they are used, and configuration is loaded on first use, so that --help
+# and --version only pay for argparse.
 
 
-def main():
-    """Main entry point for the CLI."""
+@lru_cache(maxsize=1)
+def _get_config():
+    """Return the global configuration, loading it on first use."""
+    from .config import config
+    return config
+
+
+@lru_cache(maxsize=1)
+def _get_formatter():
+    """Return the shared output formatter, creating it on first use."""
+    from .formatter import OutputFormatter
+    return OutputFormatter()
+
+
+def _apply_config_defaults(args, config):
+    """Fill in options not given on the command line from configuration."""
+    if not hasattr(args, 'format'):
+        args.format = config.get('output_format', 'plain')
+    if not hasattr(args, 'quiet'):
+        args.quiet = config.get('quiet', False)
+    if not hasattr(args, 'jobs'):
+        args.jobs = config.get('jobs', 1)
+
+
+# Full argument parser, built on first use
+_PARSER = None
+
+_VERSION = 'Code Change Summarizer 0.1.0'
+
+
+def _build_action_parser():
+    """Build a minimal parser that only recognizes the configuration-only commands."""
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--create-config', action='store_true')
+    parser.add_argument('--list-templates', action='store_true')
+    parser.add_argument('--version', action='version', version=_VERSION)
+    return parser
+
+
+def _get_parser():
+    """Return the full argument parser, building it on first use."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_full_parser()
+    return _PARSER
+
+
+def _build_full_parser():
+    """Build the argument parser for the complete command line."""
     parser = argparse.ArgumentParser(
         description='Analyze and summarize code changes from git diffs',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -54,8 +101,8 @@ Examples:
         '--format', '-f',
         type=str,
         choices=['plain', 'text', 'markdown', 'md', 'json'],
-        default=config.get('output_format', 'plain'),
-        help=f'Output format (default: {config.get("output_format", "plain")})'
+        default=argparse.SUPPRESS,
+        help='Output format (default: output_format from configuration, or plain)'
     )
     
     parser.add_argument(
@@ -96,20 +143,39 @@ Examples:
     )
     
     # Other options
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=argparse.SUPPRESS,
+        help='Worker processes for analyzing large diffs; 0 uses one per CPU '
+             '(default: jobs from configuration, or 1)'
+    )
+    
     parser.add_argument(
         '--quiet', '-q',
         action='store_true',
-        default=config.get('quiet', False),
+        default=argparse.SUPPRESS,
         help='Suppress informational messages'
     )
     
     parser.add_argument(
         '--version',
         action='version',
-        version='Code Change Summarizer 0.1.0'
+        version=_VERSION
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main entry point for the CLI."""
+    # A bare --create-config or --list-templates does not need the full parser
+    args, remaining = _build_action_parser().parse_known_args()
+    if remaining or not (args.create_config or args.list_templates):
+        args = _get_parser().parse_args()
+    
+    config = _get_config()
+    _apply_config_defaults(args, config)
     
     try:
         # Handle configuration-only commands
@@ -141,22 +207,26 @@ Examples:
         # Get input diff text
         diff_text = get_diff_input(args)
         
-        if not diff_text or not diff_text.strip():
+        if not diff_text or diff_text.isspace():
             if not args.quiet:
                 print("No diff input provided or input is empty", file=sys.stderr)
             return 1
         
         # Process the diff
-        summary = process_diff(diff_text, args.quiet)
+        summary = process_diff(diff_text, args.quiet, args.jobs)
         
         if summary is None:
             return 1
         
-        # Format output
-        output_text = format_output(summary, args)
-        
-        # Write output
-        write_output(output_text, args.output)
+        if args.output and not (args.template or args.template_name):
+            # Format straight into the output file
+            stream_output(summary, args)
+        else:
+            # Format output
+            output_text = format_output(summary, args)
+            
+            # Write output
+            write_output(output_text, args.output)
         
         return 0
         
@@ -177,26 +247,62 @@ def get_diff_input(args) -> str:
         if not os.path.exists(args.input):
             raise FileNotFoundError(f"Input file not found: {args.input}")
         
+        # Read the file once as bytes; only the decoding is retried
+        with open(args.input, 'rb') as f:
+            data = f.read()
+        
         try:
-            with open(args.input, 'r', encoding='utf-8') as f:
-                return f.read()
+            text = data.decode('utf-8')
         except UnicodeDecodeError:
             # Try with different encoding
-            with open(args.input, 'r', encoding='latin-1') as f:
-                return f.read()
+            text = data.decode('latin-1')
+        
+        # Universal newlines, as text-mode reading would give
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
     else:
         # Read from stdin
         if sys.stdin.isatty():
             print("Reading from stdin... (Press Ctrl+D when done, Ctrl+C to cancel)")
         
         try:
+            if isinstance(sys.stdin, io.TextIOWrapper):
+                return _read_text_stream(sys.stdin)
+            # Replaced streams (e.g. StringIO) have no binary buffer to read
             return sys.stdin.read()
         except UnicodeDecodeError:
             raise ValueError("Unable to decode input. Please ensure input is valid text.")
 
 
-def process_diff(diff_text: str, quiet: bool = False) -> Optional[object]:
-    """Process diff text and return summary."""
+def _read_text_stream(stream) -> str:
+    """Read all of a text stream through its binary buffer and decode it once.
+    
+    This skips the text layer's incremental decoding of every buffered chunk;
+    the stream's own encoding and error handler are still honoured.
+    """
+    text = stream.buffer.read().decode(stream.encoding, stream.errors)
+    if os.name == 'nt':
+        # The text layer translates newlines on Windows
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _is_int(value) -> bool:
+    """Return whether a setting is a real integer (bools excluded)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def process_diff(diff_text: str, quiet: bool = False, jobs: int = 1) -> Optional[object]:
+    """Process diff text and return summary.
+    
+    ``jobs`` worker processes analyze the files of large diffs; 0 starts one
+    per CPU.
+    """
+    from .parser import DiffParser
+    from .analyzer import CodeAnalyzer
+    from .generator import SummaryGenerator
+    
     try:
         if not quiet:
             print("Parsing git diff...", file=sys.stderr)
@@ -214,8 +320,16 @@ def process_diff(diff_text: str, quiet: bool = False) -> Optional[object]:
             print(f"Found {len(file_changes)} file(s) changed", file=sys.stderr)
             print("Analyzing changes...", file=sys.stderr)
         
-        # Analyze changes
-        analyzer = CodeAnalyzer()
+        # Analyze changes; invalid settings (already warned about by
+        # validate_config) fall back to the defaults
+        if not _is_int(jobs) or jobs < 0:
+            jobs = 1
+        elif jobs == 0:
+            jobs = os.cpu_count() or 1
+        max_file_size = _get_config().get('max_file_size')
+        if not _is_int(max_file_size) or max_file_size <= 0:
+            max_file_size = None
+        analyzer = CodeAnalyzer(max_workers=jobs, max_file_size=max_file_size)
         analyzed_changes = analyzer.analyze_changes(file_changes)
         
         if not quiet:
@@ -233,13 +347,13 @@ def process_diff(diff_text: str, quiet: bool = False) -> Optional[object]:
 
 def format_output(summary, args) -> str:
     """Format summary according to specified options."""
-    formatter = OutputFormatter()
+    formatter = _get_formatter()
     
     try:
         if args.template:
             return formatter.apply_template(summary, args.template)
         elif args.template_name:
-            template = config.get_template(args.template_name)
+            template = _get_config().get_template(args.template_name)
             if template is None:
                 raise ValueError(f"Template '{args.template_name}' not found in configuration")
             return formatter.apply_template(summary, template)
@@ -259,17 +373,83 @@ def write_output(output_text: str, output_file: Optional[str]):
             raise RuntimeError(f"Failed to write output file: {e}")
     else:
         try:
-            print(output_text)
+            _write_stdout(output_text)
         except UnicodeEncodeError:
             # Fallback for systems with limited unicode support
             print(output_text.encode('ascii', 'replace').decode('ascii'))
 
 
+def _new_file_mode(path: str) -> int:
+    """Permission bits for the output file: kept if it exists, else the umask default."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def stream_output(summary, args):
+    """Format summary in the specified format directly into the output file.
+    
+    The text goes to a temporary file beside the output, which replaces the
+    output only once formatting has finished, so a failure leaves an existing
+    output file as it was.
+    """
+    import tempfile
+    
+    # Replace the file a symlinked output points at, not the link
+    target = os.path.realpath(args.output)
+    try:
+        mode = _new_file_mode(target)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+    except Exception as e:
+        raise RuntimeError(f"Failed to write output file: {e}")
+    
+    try:
+        try:
+            with open(fd, 'w', encoding='utf-8') as f:
+                _get_formatter().format_output(summary, args.format, out=f)
+        except OSError as e:
+            raise RuntimeError(f"Failed to write output file: {e}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to format output: {e}")
+        
+        try:
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, target)
+        except OSError as e:
+            raise RuntimeError(f"Failed to write output file: {e}")
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_stdout(text: str):
+    """Write text and a trailing newline to stdout.
+    
+    When stdout is redirected to a file or pipe, the text is encoded once and
+    written straight to the binary buffer instead of going through the text
+    layer. Terminals, Windows (where the text layer translates newlines) and
+    replaced streams use print.
+    """
+    stream = sys.stdout
+    if isinstance(stream, io.TextIOWrapper) and os.name != 'nt' and not stream.isatty():
+        data = text.encode(stream.encoding, stream.errors)
+        stream.flush()
+        stream.buffer.write(data)
+        stream.buffer.write(b'\n')
+    else:
+        print(text)
+
+
 def validate_args(args):
     """Validate command line arguments."""
     # Validate format
-    formatter = OutputFormatter()
-    if not formatter.validate_format(args.format):
+    if not _get_formatter().validate_format(args.format):
         raise ValueError(f"Unsupported output format: {args.format}")
     
     # Validate template if provided
@@ -282,15 +462,12 @@ def validate_args(args):
         if output_dir and not os.path.exists(output_dir):
             raise ValueError(f"Output directory does not exist: {output_dir}")
         
-        # Check if we can write to the output file
-        try:
-            with open(args.output, 'w') as f:
-                pass
-            os.remove(args.output)  # Clean up test file
-        except PermissionError:
+        # Check if we can write to the output file without creating or
+        # truncating it: an existing file must be writable, a new one needs
+        # a writable directory
+        target = args.output if os.path.exists(args.output) else (output_dir or '.')
+        if not os.access(target, os.W_OK):
             raise ValueError(f"Permission denied: cannot write to {args.output}")
-        except Exception as e:
-            raise ValueError(f"Cannot write to output file {args.output}: {e}")
 
 
 if __name__ == '__main__':
@@ -11,6 +11,8 @@ from pathlib import Path
 class Config:
     """Configuration manager for the code change summarizer."""
     
+    __slots__ = ('config', '_valid_key')
+    
     DEFAULT_CONFIG = {
         "output_format": "plain",
         "quiet": False,
@@ -18,6 +20,7 @@ class Config:
         "include_key_changes": True,
         "complexity_threshold": 5,
         "max_file_size": 1000000,  # 1MB
+        "jobs": 1,  # worker processes for analysis; 0 = one per CPU
         "supported_extensions": [
             ".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go", ".rs",
             ".c", ".cpp", ".h", ".hpp", ".cs", ".php", ".rb", ".swift",
@@ -38,35 +41,62 @@ class Config:
         }
     }
     
+    # Environment variables and the configuration keys they set
+    _ENV_MAPPINGS = {
+        'CODE_SUMMARIZER_FORMAT': 'output_format',
+        'CODE_SUMMARIZER_QUIET': 'quiet',
+        'CODE_SUMMARIZER_COMPLEXITY_THRESHOLD': 'complexity_threshold',
+        'CODE_SUMMARIZER_MAX_FILE_SIZE': 'max_file_size',
+        'CODE_SUMMARIZER_JOBS': 'jobs'
+    }
+    
+    # Conversions for environment values of non-string settings
+    _ENV_COERCIONS = {
+        'quiet': lambda value: value.lower() in ('true', '1', 'yes', 'on'),
+        'complexity_threshold': int,
+        'max_file_size': int,
+        'jobs': int,
+    }
+    
     def __init__(self):
         self.config = self.DEFAULT_CONFIG.copy()
+        # Settings that last passed validate_config()
+        self._valid_key = None
         self._load_config()
     
     def _load_config(self):
         """Load configuration from various sources."""
+        # The files are read on every run rather than cached: a cache file
+        # keyed on their stat() results would need its own open and
+        # json.load, costing about as much as the reads it replaces
+        
         # Load from user config file
-        user_config_path = self._get_user_config_path()
-        if user_config_path.exists():
-            try:
-                with open(user_config_path, 'r', encoding='utf-8') as f:
-                    user_config = json.load(f)
+        try:
+            user_config = self._read_config_file(self._get_user_config_path())
+            if user_config is not None:
                 self.config.update(user_config)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not load user config: {e}")
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not load user config: {e}")
         
         # Load from project config file
-        project_config_path = self._get_project_config_path()
-        if project_config_path.exists():
-            try:
-                with open(project_config_path, 'r', encoding='utf-8') as f:
-                    project_config = json.load(f)
+        try:
+            project_config = self._read_config_file(self._get_project_config_path())
+            if project_config is not None:
                 self.config.update(project_config)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not load project config: {e}")
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not load project config: {e}")
         
         # Load from environment variables
         self._load_from_env()
     
+    def _read_config_file(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Read a JSON configuration file, or return None if it does not exist."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
     def _get_user_config_path(self) -> Path:
         """Get the path to the user configuration file."""
         home = Path.home()
@@ -78,26 +108,18 @@ class Config:
     
     def _load_from_env(self):
         """Load configuration from environment variables."""
-        env_mappings = {
-            'CODE_SUMMARIZER_FORMAT': 'output_format',
-            'CODE_SUMMARIZER_QUIET': 'quiet',
-            'CODE_SUMMARIZER_COMPLEXITY_THRESHOLD': 'complexity_threshold',
-            'CODE_SUMMARIZER_MAX_FILE_SIZE': 'max_file_size'
-        }
-        
-        for env_var, config_key in env_mappings.items():
-            value = os.getenv(env_var)
+        for env_var, config_key in self._ENV_MAPPINGS.items():
+            value = os.environ.get(env_var)
             if value is not None:
                 # Convert string values to appropriate types
-                if config_key in ['quiet']:
-                    self.config[config_key] = value.lower() in ('true', '1', 'yes', 'on')
-                elif config_key in ['complexity_threshold', 'max_file_size']:
-                    try:
-                        self.config[config_key] = int(value)
-                    except ValueError:
-                        print(f"Warning: Invalid value for {env_var}: {value}")
-                else:
+                coerce = self._ENV_COERCIONS.get(config_key)
+                if coerce is None:
                     self.config[config_key] = value
+                    continue
+                try:
+                    self.config[config_key] = coerce(value)
+                except ValueError:
+                    print(f"Warning: Invalid value for {env_var}: {value}")
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value."""
@@ -143,14 +165,36 @@ class Config:
         except IOError as e:
             print(f"Error creating sample config: {e}")
     
+    def _validated_key(self) -> tuple:
+        """Key identifying the validated settings, including their types."""
+        values = (
+            self.config.get('output_format'),
+            self.config.get('complexity_threshold', 0),
+            self.config.get('max_file_size', 0),
+            self.config.get('jobs', 1),
+        )
+        return tuple((type(value), value) for value in values)
+    
     def validate_config(self) -> bool:
-        """Validate the current configuration."""
+        """Validate the current configuration.
+        
+        A successful validation is remembered until one of the validated
+        settings changes; invalid settings are re-checked, and warned about,
+        on every call.
+        """
+        key = self._validated_key()
+        if key == self._valid_key:
+            return True
+        
         valid = True
         
-        # Validate output format
-        valid_formats = ['plain', 'text', 'markdown', 'md', 'json']
-        if self.config.get('output_format') not in valid_formats:
-            print(f"Warning: Invalid output_format. Must be one of: {valid_formats}")
+        # Validate output format; the formatter is imported here so that
+        # loading the configuration does not pull it in
+        from .formatter import OutputFormatter
+        valid_formats = OutputFormatter.SUPPORTED_FORMATS
+        output_format = self.config.get('output_format')
+        if not isinstance(output_format, str) or output_format not in valid_formats:
+            print(f"Warning: Invalid output_format. Must be one of: {sorted(valid_formats)}")
             valid = False
         
         # Validate complexity threshold
@@ -165,6 +209,14 @@ class Config:
             print("Warning: max_file_size must be a positive integer")
             valid = False
         
+        # Validate worker count
+        jobs = self.config.get('jobs', 1)
+        if not isinstance(jobs, int) or jobs < 0:
+            print("Warning: jobs must be a non-negative integer")
+            valid = False
+        
+        if valid:
+            self._valid_key = key
         return valid
     
     def get_template(self, name: str) -> Optional[str]:
@@ -4,18 +4,66 @@ Output formatting module.
 
 import json
 import logging
-from typing import Dict, Any
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional, TextIO
 from .models import Summary
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the json module
+    orjson = None
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+# Fixed report scaffolding, built once
+_MARKDOWN_TITLE = "# Code Change Summary\n\n## Overview\n"
+_PLAIN_TITLE = "CODE CHANGE SUMMARY\n" + "=" * 50 + "\n\nOVERVIEW:\n"
+_PLAIN_FILE_DETAILS = "\nFILE DETAILS:\n" + "-" * 30 + "\n"
+
+
+# How each template variable is computed from a summary
+_TEMPLATE_VARIABLES = {
+    'overview': lambda formatter, summary: summary.overview or "",
+    'total_files': lambda formatter, summary: summary.statistics.total_files,
+    'files_added': lambda formatter, summary: summary.statistics.files_added,
+    'files_modified': lambda formatter, summary: summary.statistics.files_modified,
+    'files_deleted': lambda formatter, summary: summary.statistics.files_deleted,
+    'lines_added': lambda formatter, summary: summary.statistics.total_lines_added,
+    'lines_removed': lambda formatter, summary: summary.statistics.total_lines_removed,
+    'key_changes': lambda formatter, summary: '\n'.join(f"- {change}" for change in summary.key_changes),
+    'recommendations': lambda formatter, summary: '\n'.join(f"- {rec}" for rec in summary.recommendations),
+    'file_summaries': lambda formatter, summary: formatter._format_file_summaries_for_template(summary.file_summaries),
+}
+
+
+class _TemplateVariables(dict):
+    """Template variables for one summary, computed on first use."""
+    
+    def __init__(self, formatter, summary: Summary):
+        super().__init__()
+        self._formatter = formatter
+        self._summary = summary
+    
+    def __missing__(self, key):
+        compute = _TEMPLATE_VARIABLES.get(key)
+        if compute is None:
+            raise KeyError(key)
+        value = self[key] = compute(self._formatter, self._summary)
+        return value
+
+
 class OutputFormatter:
     """Formats summaries according to specified output format."""
     
-    def format_output(self, summary: Summary, format_type: str) -> str:
-        """Format summary according to the specified format type."""
+    def format_output(self, summary: Summary, format_type: str, out: Optional[TextIO] = None) -> Optional[str]:
+        """Format summary according to the specified format type.
+        
+        If ``out`` is given, the output is written to it piece by piece and
+        None is returned, so large summaries are never held in memory as
+        one string; otherwise the formatted text is returned.
+        """
         if not summary:
             raise ValueError("Summary cannot be None")
         
@@ -23,19 +71,20 @@ class OutputFormatter:
             raise ValueError("Format type cannot be empty")
         
         format_type = format_type.lower()
-        logger.debug(f"Formatting output as {format_type}")
+        logger.debug("Formatting output as %s", format_type)
         
         try:
-            if format_type == 'json':
-                return self._format_json(summary)
-            elif format_type == 'markdown' or format_type == 'md':
-                return self._format_markdown(summary)
-            elif format_type == 'plain' or format_type == 'text':
-                return self._format_plain_text(summary)
-            else:
+            format_method = self._FORMAT_METHODS.get(format_type)
+            if format_method is None:
                 raise ValueError(f"Unsupported format type: {format_type}")
+            if out is not None:
+                format_method(self, summary, out.write)
+                return None
+            parts = []
+            format_method(self, summary, parts.append)
+            return ''.join(parts)
         except Exception as e:
-            logger.error(f"Error formatting output as {format_type}: {e}")
+            logger.error("Error formatting output as %s: %s", format_type, e)
             raise
     
     def apply_template(self, summary: Summary, template: str) -> str:
@@ -49,190 +98,152 @@ class OutputFormatter:
         logger.debug("Applying custom template")
         
         try:
-            # Simple template substitution using string formatting
-            template_vars = {
-                'overview': summary.overview or "",
-                'total_files': summary.statistics.total_files,
-                'files_added': summary.statistics.files_added,
-                'files_modified': summary.statistics.files_modified,
-                'files_deleted': summary.statistics.files_deleted,
-                'lines_added': summary.statistics.total_lines_added,
-                'lines_removed': summary.statistics.total_lines_removed,
-                'key_changes': '\n'.join(f"- {change}" for change in summary.key_changes),
-                'recommendations': '\n'.join(f"- {rec}" for rec in summary.recommendations),
-                'file_summaries': self._format_file_summaries_for_template(summary.file_summaries)
-            }
-            
-            return template.format(**template_vars)
+            # Variables are computed only when the template references them
+            return template.format_map(_TemplateVariables(self, summary))
             
         except KeyError as e:
-            logger.error(f"Template variable not found: {e}")
+            logger.error("Template variable not found: %s", e)
             raise ValueError(f"Template variable not found: {e}")
         except Exception as e:
-            logger.error(f"Error applying template: {e}")
+            logger.error("Error applying template: %s", e)
             raise ValueError(f"Error applying template: {e}")
     
-    def _format_json(self, summary: Summary) -> str:
+    def _format_json(self, summary: Summary, write: Callable[[str], Any]):
         """Format summary as JSON."""
+        # Statistics and file summaries serialize field for field, in order
         data = {
             'overview': summary.overview,
-            'statistics': {
-                'total_files': summary.statistics.total_files,
-                'files_added': summary.statistics.files_added,
-                'files_modified': summary.statistics.files_modified,
-                'files_deleted': summary.statistics.files_deleted,
-                'total_lines_added': summary.statistics.total_lines_added,
-                'total_lines_removed': summary.statistics.total_lines_removed
-            },
-            'file_summaries': [
-                {
-                    'filename': fs.filename,
-                    'summary': fs.summary,
-                    'key_changes': fs.key_changes
-                }
-                for fs in summary.file_summaries
-            ],
+            'statistics': asdict(summary.statistics),
+            'file_summaries': [asdict(fs) for fs in summary.file_summaries],
             'key_changes': summary.key_changes,
             'recommendations': summary.recommendations
         }
         
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            try:
+                write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8'))
+                return
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits; the json module handles them
+                pass
+        
+        write(json.dumps(data, indent=2, ensure_ascii=False))
     
-    def _format_markdown(self, summary: Summary) -> str:
+    def _format_markdown(self, summary: Summary, write: Callable[[str], Any]):
         """Format summary as Markdown."""
-        lines = []
-        
-        # Title
-        lines.append("# Code Change Summary")
-        lines.append("")
+        stats = summary.statistics
         
-        # Overview
-        lines.append("## Overview")
-        lines.append(summary.overview)
-        lines.append("")
+        # Title, overview and statistics
+        write(
+            f"{_MARKDOWN_TITLE}{summary.overview}\n\n"
+            f"## Statistics\n- **Total files changed:** {stats.total_files}\n"
+            + (f"- **Files added:** {stats.files_added}\n" if stats.files_added > 0 else "")
+            + (f"- **Files modified:** {stats.files_modified}\n" if stats.files_modified > 0 else "")
+            + (f"- **Files deleted:** {stats.files_deleted}\n" if stats.files_deleted > 0 else "")
+            + f"- **Lines added:** +{stats.total_lines_added}\n"
+              f"- **Lines removed:** -{stats.total_lines_removed}\n"
+        )
         
-        # Statistics
-        lines.append("## Statistics")
-        stats = summary.statistics
-        lines.append(f"- **Total files changed:** {stats.total_files}")
-        if stats.files_added > 0:
-            lines.append(f"- **Files added:** {stats.files_added}")
-        if stats.files_modified > 0:
-            lines.append(f"- **Files modified:** {stats.files_modified}")
-        if stats.files_deleted > 0:
-            lines.append(f"- **Files deleted:** {stats.files_deleted}")
-        lines.append(f"- **Lines added:** +{stats.total_lines_added}")
-        lines.append(f"- **Lines removed:** -{stats.total_lines_removed}")
-        lines.append("")
+        # Sections and file entries are separated by a blank line written
+        # ahead of each, so nothing has to be trimmed from the end
         
         # Key Changes
         if summary.key_changes:
-            lines.append("## Key Changes")
+            write("\n## Key Changes\n")
             for change in summary.key_changes:
-                lines.append(f"- {change}")
-            lines.append("")
+                write(f"- {change}\n")
         
         # File Details
         if summary.file_summaries:
-            lines.append("## File Details")
+            write("\n## File Details\n")
+            separator = ""
             for file_summary in summary.file_summaries:
-                lines.append(f"### {file_summary.filename}")
-                lines.append(file_summary.summary)
+                write(f"{separator}### {file_summary.filename}\n{file_summary.summary}\n")
+                separator = "\n"
                 
                 if file_summary.key_changes:
-                    lines.append("")
-                    lines.append("**Key changes:**")
+                    write("\n**Key changes:**\n")
                     for key_change in file_summary.key_changes:
-                        lines.append(f"- {key_change}")
-                
-                lines.append("")
+                        write(f"- {key_change}\n")
         
         # Recommendations
         if summary.recommendations:
-            lines.append("## Recommendations")
+            write("\n## Recommendations\n")
             for recommendation in summary.recommendations:
-                lines.append(f"- {recommendation}")
-            lines.append("")
-        
-        return '\n'.join(lines)
+                write(f"- {recommendation}\n")
     
-    def _format_plain_text(self, summary: Summary) -> str:
+    def _format_plain_text(self, summary: Summary, write: Callable[[str], Any]):
         """Format summary as plain text."""
-        lines = []
-        
-        # Title
-        lines.append("CODE CHANGE SUMMARY")
-        lines.append("=" * 50)
-        lines.append("")
+        stats = summary.statistics
         
-        # Overview
-        lines.append("OVERVIEW:")
-        lines.append(summary.overview)
-        lines.append("")
+        # Title, overview and statistics
+        write(
+            f"{_PLAIN_TITLE}{summary.overview}\n\n"
+            f"STATISTICS:\n  Total files changed: {stats.total_files}\n"
+            + (f"  Files added: {stats.files_added}\n" if stats.files_added > 0 else "")
+            + (f"  Files modified: {stats.files_modified}\n" if stats.files_modified > 0 else "")
+            + (f"  Files deleted: {stats.files_deleted}\n" if stats.files_deleted > 0 else "")
+            + f"  Lines added: +{stats.total_lines_added}\n"
+              f"  Lines removed: -{stats.total_lines_removed}\n"
+        )
         
-        # Statistics
-        lines.append("STATISTICS:")
-        stats = summary.statistics
-        lines.append(f"  Total files changed: {stats.total_files}")
-        if stats.files_added > 0:
-            lines.append(f"  Files added: {stats.files_added}")
-        if stats.files_modified > 0:
-            lines.append(f"  Files modified: {stats.files_modified}")
-        if stats.files_deleted > 0:
-            lines.append(f"  Files deleted: {stats.files_deleted}")
-        lines.append(f"  Lines added: +{stats.total_lines_added}")
-        lines.append(f"  Lines removed: -{stats.total_lines_removed}")
-        lines.append("")
+        # Sections and file entries are separated by a blank line written
+        # ahead of each, so nothing has to be trimmed from the end
         
         # Key Changes
         if summary.key_changes:
-            lines.append("KEY CHANGES:")
+            write("\nKEY CHANGES:\n")
             for i, change in enumerate(summary.key_changes, 1):
-                lines.append(f"  {i}. {change}")
-            lines.append("")
+                write(f"  {i}. {change}\n")
         
         # File Details
         if summary.file_summaries:
-            lines.append("FILE DETAILS:")
-            lines.append("-" * 30)
+            write(_PLAIN_FILE_DETAILS)
+            separator = ""
             for file_summary in summary.file_summaries:
-                lines.append(f"File: {file_summary.filename}")
-                lines.append(f"Summary: {file_summary.summary}")
+                write(f"{separator}File: {file_summary.filename}\nSummary: {file_summary.summary}\n")
+                separator = "\n"
                 
                 if file_summary.key_changes:
-                    lines.append("Key changes:")
+                    write("Key changes:\n")
                     for key_change in file_summary.key_changes:
-                        lines.append(f"  - {key_change}")
-                
-                lines.append("")
+                        write(f"  - {key_change}\n")
         
         # Recommendations
         if summary.recommendations:
-            lines.append("RECOMMENDATIONS:")
+            write("\nRECOMMENDATIONS:\n")
             for i, recommendation in enumerate(summary.recommendations, 1):
-                lines.append(f"  {i}. {recommendation}")
-            lines.append("")
-        
-        return '\n'.join(lines)
+                write(f"  {i}. {recommendation}\n")
     
     def _format_file_summaries_for_template(self, file_summaries) -> str:
         """Format file summaries for template substitution."""
         if not file_summaries:
             return "No file changes"
         
+        # A list joined once measured faster here than a generator fed to join
         lines = []
+        append = lines.append
         for fs in file_summaries:
-            lines.append(f"- {fs.filename}: {fs.summary}")
-            if fs.key_changes:
-                for key_change in fs.key_changes:
-                    lines.append(f"  - {key_change}")
+            append(f"- {fs.filename}: {fs.summary}")
+            for key_change in fs.key_changes:
+                append(f"  - {key_change}")
         
         return '\n'.join(lines)
     
+    # Format type (and its aliases) to formatting method
+    _FORMAT_METHODS = {
+        'json': _format_json,
+        'markdown': _format_markdown,
+        'md': _format_markdown,
+        'plain': _format_plain_text,
+        'text': _format_plain_text,
+    }
+    SUPPORTED_FORMATS = frozenset(_FORMAT_METHODS)
+    
     def get_supported_formats(self) -> list:
         """Get list of supported output formats."""
-        return ['json', 'markdown', 'md', 'plain', 'text']
+        return list(self._FORMAT_METHODS)
     
     def validate_format(self, format_type: str) -> bool:
         """Validate if the format type is supported."""
-        return format_type.lower() in self.get_supported_formats()
\ No newline at end of file
+        return format_type.lower() in self.SUPPORTED_FORMATS
\ No newline at end of file
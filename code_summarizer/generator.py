@@ -3,12 +3,54 @@ Summary generation module.
 """
 
 import logging
-from typing import List
-from .models import AnalyzedChange, Summary, FileSummary, ChangeStatistics
+from collections import Counter
+from functools import lru_cache
+from itertools import chain, islice
+from typing import List, Tuple
+from .models import AnalyzedChange, ChangeAggregate, Summary, FileSummary, ChangeStatistics
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Structural change actions, in the order they are described
+_STRUCTURAL_ACTIONS = ('added', 'removed', 'modified')
+_ACTION_VERBS = {action: action.capitalize() for action in _STRUCTURAL_ACTIONS}
+
+
+@lru_cache(maxsize=512)
+def _describe_footprint(footprint: Tuple[Tuple[str, str], ...]) -> str:
+    """Describe structural changes given as (change_type, element_name) pairs.
+    
+    Cached because files across a diff often share the same footprint.
+    """
+    # Tally changes per (base type, action); only the first name of each is ever shown
+    counts = Counter()
+    first_names = {}
+    base_types = {}  # Ordered by first appearance
+    for change_type, element_name in footprint:
+        base_type = change_type.partition('_')[0]  # Get base type (function, class, etc.)
+        base_types.setdefault(base_type)
+        _, separator, action = change_type.rpartition('_')
+        if separator and action in _STRUCTURAL_ACTIONS:
+            key = (base_type, action)
+            counts[key] += 1
+            first_names.setdefault(key, element_name)
+    
+    descriptions = []
+    for base_type in base_types:
+        type_descriptions = []
+        for action in _STRUCTURAL_ACTIONS:
+            count = counts.get((base_type, action))
+            if count == 1:
+                type_descriptions.append(f"{action} {base_type} {first_names[base_type, action]}")
+            elif count:
+                type_descriptions.append(f"{action} {count} {base_type}s")
+        
+        if type_descriptions:
+            descriptions.append(', '.join(type_descriptions))
+    
+    return '; '.join(descriptions)
+
 
 class SummaryGenerator:
     """Generates human-readable summaries from analyzed changes."""
@@ -26,7 +68,7 @@ class SummaryGenerator:
             )
         
         try:
-            logger.debug(f"Generating summary for {len(analyzed_changes)} analyzed changes")
+            logger.debug("Generating summary for %s analyzed changes", len(analyzed_changes))
             
             # Generate file summaries
             file_summaries = []
@@ -35,7 +77,7 @@ class SummaryGenerator:
                     file_summary = self._create_file_summary(change)
                     file_summaries.append(file_summary)
                 except Exception as e:
-                    logger.error(f"Error creating file summary for {change.file_change.filename}: {e}")
+                    logger.error("Error creating file summary for %s: %s", change.file_change.filename, e)
                     # Create a minimal file summary to avoid breaking the pipeline
                     file_summaries.append(FileSummary(
                         filename=change.file_change.filename,
@@ -43,17 +85,18 @@ class SummaryGenerator:
                         key_changes=[]
                     ))
             
-            # Calculate statistics
-            statistics = self._calculate_statistics(analyzed_changes)
+            # Gather statistics and everything else the summary needs in one pass
+            aggregate = self._aggregate(analyzed_changes)
+            statistics = aggregate.statistics
             
             # Generate overall overview
-            overview = self._generate_overview(analyzed_changes, statistics)
+            overview = self._generate_overview(aggregate)
             
             # Identify key changes
-            key_changes = self._identify_key_changes(analyzed_changes)
+            key_changes = self._identify_key_changes(aggregate)
             
             # Generate recommendations
-            recommendations = self._generate_recommendations(analyzed_changes)
+            recommendations = self._generate_recommendations(aggregate)
             
             logger.debug("Successfully generated summary")
             return Summary(
@@ -65,7 +108,7 @@ class SummaryGenerator:
             )
             
         except Exception as e:
-            logger.error(f"Error generating summary: {e}")
+            logger.error("Error generating summary: %s", e)
             # Return a minimal summary to avoid breaking the pipeline
             return Summary(
                 overview="Error generating summary",
@@ -78,38 +121,40 @@ class SummaryGenerator:
     def create_change_description(self, change: AnalyzedChange) -> str:
         """Create human-readable description of a change."""
         file_change = change.file_change
-        descriptions = []
+        change_type = file_change.change_type
         
         # File-level description
-        if file_change.change_type == 'added':
-            descriptions.append(f"Added new file '{file_change.filename}'")
-        elif file_change.change_type == 'deleted':
-            descriptions.append(f"Deleted file '{file_change.filename}'")
-        elif file_change.change_type == 'renamed':
-            descriptions.append(f"Renamed '{file_change.old_filename}' to '{file_change.filename}'")
+        if change_type == 'added':
+            description = f"Added new file '{file_change.filename}'"
+        elif change_type == 'deleted':
+            description = f"Deleted file '{file_change.filename}'"
+        elif change_type == 'renamed':
+            description = f"Renamed '{file_change.old_filename}' to '{file_change.filename}'"
         else:
-            descriptions.append(f"Modified '{file_change.filename}'")
+            description = f"Modified '{file_change.filename}'"
         
         # Add line change information
-        if file_change.lines_added > 0 or file_change.lines_removed > 0:
-            line_info = []
-            if file_change.lines_added > 0:
-                line_info.append(f"+{file_change.lines_added} lines")
-            if file_change.lines_removed > 0:
-                line_info.append(f"-{file_change.lines_removed} lines")
-            descriptions.append(f"({', '.join(line_info)})")
+        added = file_change.lines_added
+        removed = file_change.lines_removed
+        if added > 0 and removed > 0:
+            description = f"{description} - (+{added} lines, -{removed} lines)"
+        elif added > 0:
+            description = f"{description} - (+{added} lines)"
+        elif removed > 0:
+            description = f"{description} - (-{removed} lines)"
         
         # Add structural changes
         if change.structural_changes:
             structural_desc = self._describe_structural_changes(change.structural_changes)
             if structural_desc:
-                descriptions.append(structural_desc)
+                description = f"{description} - {structural_desc}"
         
         # Add purpose if available
-        if change.purpose_inference and change.purpose_inference != "Code modification":
-            descriptions.append(f"Purpose: {change.purpose_inference}")
+        purpose = change.purpose_inference
+        if purpose and purpose != "Code modification":
+            description = f"{description} - Purpose: {purpose}"
         
-        return " - ".join(descriptions)
+        return description
     
     def _create_file_summary(self, change: AnalyzedChange) -> FileSummary:
         """Create a summary for a single file change."""
@@ -123,12 +168,10 @@ class SummaryGenerator:
         
         # Add structural changes as key changes
         for sc in change.structural_changes:
-            if sc.change_type.endswith('_added'):
-                key_changes.append(f"Added {sc.change_type.replace('_added', '')} '{sc.element_name}'")
-            elif sc.change_type.endswith('_removed'):
-                key_changes.append(f"Removed {sc.change_type.replace('_removed', '')} '{sc.element_name}'")
-            elif sc.change_type.endswith('_modified'):
-                key_changes.append(f"Modified {sc.change_type.replace('_modified', '')} '{sc.element_name}'")
+            element_type, separator, action = sc.change_type.rpartition('_')
+            verb = _ACTION_VERBS.get(action) if separator else None
+            if verb:
+                key_changes.append(f"{verb} {element_type} '{sc.element_name}'")
         
         # Add complexity indicator if high
         if change.complexity_score >= 7:
@@ -146,28 +189,103 @@ class SummaryGenerator:
             key_changes=key_changes
         )
     
-    def _calculate_statistics(self, analyzed_changes: List[AnalyzedChange]) -> ChangeStatistics:
-        """Calculate overall statistics for the changes."""
-        stats = ChangeStatistics()
+    def _aggregate(self, analyzed_changes: List[AnalyzedChange]) -> ChangeAggregate:
+        """Collect statistics and per-file findings for the whole summary in one pass."""
+        files_modified = 0
+        total_lines_added = 0
+        total_lines_removed = 0
+        purpose_counts = Counter()
+        high_complexity = []
+        new_files = []
+        deleted_files = []
+        large_changes = []
+        multi_class_files = []
+        test_file_count = 0
+        total_lines_changed = 0
+        has_doc_changes = False
+        has_new_features = False
+        has_api_changes = False
+        has_dependency_changes = False
         
         for change in analyzed_changes:
             file_change = change.file_change
-            stats.total_files += 1
+            filename = file_change.filename
+            change_type = file_change.change_type
+            lines_added = file_change.lines_added
+            lines_removed = file_change.lines_removed
+            lines_changed = lines_added + lines_removed
+            
+            # Statistics, kept in locals until the loop ends
+            if change_type == 'added':
+                new_files.append(filename)
+            elif change_type == 'modified':
+                files_modified += 1
+            elif change_type == 'deleted':
+                deleted_files.append(filename)
+            total_lines_added += lines_added
+            total_lines_removed += lines_removed
+            total_lines_changed += lines_changed
             
-            if file_change.change_type == 'added':
-                stats.files_added += 1
-            elif file_change.change_type == 'modified':
-                stats.files_modified += 1
-            elif file_change.change_type == 'deleted':
-                stats.files_deleted += 1
+            # Purposes, complexity and size
+            if change.purpose_inference:
+                purpose_counts.update(change.purpose_inference.split('; '))
+            if change.complexity_score >= 7:
+                high_complexity.append(filename)
+            if lines_changed > 100:
+                large_changes.append((filename, lines_changed))
+            
+            # Structural changes
+            class_changes = 0
+            for sc in change.structural_changes:
+                if 'class' in sc.change_type:
+                    class_changes += 1
+                if not has_dependency_changes and 'import' in sc.change_type:
+                    has_dependency_changes = True
+            if class_changes > 2:
+                multi_class_files.append(filename)
             
-            stats.total_lines_added += file_change.lines_added
-            stats.total_lines_removed += file_change.lines_removed
+            # Test files, documentation, features and API changes
+            filename_lower = filename.lower()
+            if 'test' in filename_lower or 'spec' in filename_lower:
+                test_file_count += 1
+            # Once a flag is set, later changes skip its search
+            if not (has_doc_changes and has_new_features):
+                purpose_lower = change.purpose_inference.lower()
+                if not has_doc_changes and 'documentation' in purpose_lower:
+                    has_doc_changes = True
+                if not has_new_features and 'feature addition' in purpose_lower:
+                    has_new_features = True
+            if not has_api_changes and 'public api' in change.impact_assessment.lower():
+                has_api_changes = True
+        
+        statistics = ChangeStatistics(
+            total_files=len(analyzed_changes),
+            files_added=len(new_files),
+            files_modified=files_modified,
+            files_deleted=len(deleted_files),
+            total_lines_added=total_lines_added,
+            total_lines_removed=total_lines_removed
+        )
         
-        return stats
+        return ChangeAggregate(
+            statistics=statistics,
+            purpose_counts=purpose_counts,
+            high_complexity=high_complexity,
+            new_files=new_files,
+            deleted_files=deleted_files,
+            large_changes=large_changes,
+            multi_class_files=multi_class_files,
+            test_file_count=test_file_count,
+            total_lines_changed=total_lines_changed,
+            has_doc_changes=has_doc_changes,
+            has_new_features=has_new_features,
+            has_api_changes=has_api_changes,
+            has_dependency_changes=has_dependency_changes
+        )
     
-    def _generate_overview(self, analyzed_changes: List[AnalyzedChange], statistics: ChangeStatistics) -> str:
+    def _generate_overview(self, aggregate: ChangeAggregate) -> str:
         """Generate an overall overview of the changes."""
+        statistics = aggregate.statistics
         overview_parts = []
         
         # Basic statistics
@@ -194,102 +312,64 @@ class SummaryGenerator:
         if line_changes:
             overview_parts.append(f"({', '.join(line_changes)} lines)")
         
-        # Dominant purposes
-        purposes = []
-        for change in analyzed_changes:
-            if change.purpose_inference:
-                purposes.extend(change.purpose_inference.split('; '))
-        
-        # Count purpose frequency
-        purpose_counts = {}
-        for purpose in purposes:
-            purpose_counts[purpose] = purpose_counts.get(purpose, 0) + 1
-        
-        # Get most common purposes
-        if purpose_counts:
-            sorted_purposes = sorted(purpose_counts.items(), key=lambda x: x[1], reverse=True)
-            top_purposes = [p[0] for p in sorted_purposes[:3]]
-            if top_purposes:
-                overview_parts.append(f"Primary focus: {', '.join(top_purposes)}")
+        # Most common purposes; ties keep the order purposes were first seen
+        top_purposes = [purpose for purpose, _ in aggregate.purpose_counts.most_common(3)]
+        if top_purposes:
+            overview_parts.append(f"Primary focus: {', '.join(top_purposes)}")
         
         return ". ".join(overview_parts) + "."
     
-    def _identify_key_changes(self, analyzed_changes: List[AnalyzedChange]) -> List[str]:
+    def _identify_key_changes(self, aggregate: ChangeAggregate) -> List[str]:
         """Identify the most important changes across all files."""
-        key_changes = []
-        
-        # High complexity changes
-        high_complexity_changes = [c for c in analyzed_changes if c.complexity_score >= 7]
-        for change in high_complexity_changes:
-            key_changes.append(f"High complexity change in {change.file_change.filename}")
-        
-        # New files
-        new_files = [c for c in analyzed_changes if c.file_change.change_type == 'added']
+        # New files are summarised as one entry when there are many
+        new_files = aggregate.new_files
         if len(new_files) > 3:
-            key_changes.append(f"Multiple new files added ({len(new_files)} files)")
+            new_file_changes = (f"Multiple new files added ({len(new_files)} files)",)
         else:
-            for change in new_files:
-                key_changes.append(f"New file: {change.file_change.filename}")
-        
-        # Deleted files
-        deleted_files = [c for c in analyzed_changes if c.file_change.change_type == 'deleted']
-        for change in deleted_files:
-            key_changes.append(f"Deleted file: {change.file_change.filename}")
-        
-        # Large changes
-        large_changes = [c for c in analyzed_changes 
-                        if (c.file_change.lines_added + c.file_change.lines_removed) > 100]
-        for change in large_changes:
-            total_lines = change.file_change.lines_added + change.file_change.lines_removed
-            key_changes.append(f"Large change in {change.file_change.filename} ({total_lines} lines)")
-        
-        # Significant structural changes
-        for change in analyzed_changes:
-            class_changes = [sc for sc in change.structural_changes if 'class' in sc.change_type]
-            if len(class_changes) > 2:
-                key_changes.append(f"Multiple class changes in {change.file_change.filename}")
+            new_file_changes = (f"New file: {filename}" for filename in new_files)
+        
+        # Categories in priority order, formatted lazily so nothing past the limit is built
+        key_changes = chain(
+            (f"High complexity change in {filename}" for filename in aggregate.high_complexity),
+            new_file_changes,
+            (f"Deleted file: {filename}" for filename in aggregate.deleted_files),
+            (f"Large change in {filename} ({total_lines} lines)"
+             for filename, total_lines in aggregate.large_changes),
+            (f"Multiple class changes in {filename}" for filename in aggregate.multi_class_files),
+        )
         
-        return key_changes[:10]  # Limit to top 10 key changes
+        return list(islice(key_changes, 10))  # Limit to top 10 key changes
     
-    def _generate_recommendations(self, analyzed_changes: List[AnalyzedChange]) -> List[str]:
+    def _generate_recommendations(self, aggregate: ChangeAggregate) -> List[str]:
         """Generate recommendations based on the changes."""
         recommendations = []
         
         # High complexity warnings
-        high_complexity_count = len([c for c in analyzed_changes if c.complexity_score >= 7])
+        high_complexity_count = len(aggregate.high_complexity)
         if high_complexity_count > 0:
             recommendations.append(f"Review {high_complexity_count} high-complexity changes carefully")
         
         # Test coverage recommendations
-        test_files = [c for c in analyzed_changes 
-                     if 'test' in c.file_change.filename.lower() or 'spec' in c.file_change.filename.lower()]
-        non_test_files = [c for c in analyzed_changes if c not in test_files]
+        test_file_count = aggregate.test_file_count
+        non_test_file_count = aggregate.statistics.total_files - test_file_count
         
-        if len(non_test_files) > len(test_files) * 2:
+        if non_test_file_count > test_file_count * 2:
             recommendations.append("Consider adding tests for the new functionality")
         
         # Documentation recommendations
-        has_doc_changes = any('documentation' in c.purpose_inference.lower() for c in analyzed_changes)
-        has_new_features = any('feature addition' in c.purpose_inference.lower() for c in analyzed_changes)
-        
-        if has_new_features and not has_doc_changes:
+        if aggregate.has_new_features and not aggregate.has_doc_changes:
             recommendations.append("Consider updating documentation for new features")
         
         # API change warnings
-        api_changes = [c for c in analyzed_changes if 'public api' in c.impact_assessment.lower()]
-        if api_changes:
+        if aggregate.has_api_changes:
             recommendations.append("API changes detected - ensure backward compatibility")
         
         # Large scale change recommendations
-        total_lines_changed = sum(c.file_change.lines_added + c.file_change.lines_removed 
-                                for c in analyzed_changes)
-        if total_lines_changed > 500:
+        if aggregate.total_lines_changed > 500:
             recommendations.append("Large-scale changes - consider breaking into smaller commits")
         
         # Dependency change recommendations
-        dependency_changes = [c for c in analyzed_changes 
-                            if any('import' in sc.change_type for sc in c.structural_changes)]
-        if dependency_changes:
+        if aggregate.has_dependency_changes:
             recommendations.append("Dependency changes detected - verify build and deployment")
         
         return recommendations[:8]  # Limit to top 8 recommendations
@@ -299,43 +379,5 @@ class SummaryGenerator:
         if not structural_changes:
             return ""
         
-        # Group changes by type
-        change_groups = {}
-        for sc in structural_changes:
-            change_type = sc.change_type.split('_')[0]  # Get base type (function, class, etc.)
-            if change_type not in change_groups:
-                change_groups[change_type] = {'added': [], 'removed': [], 'modified': []}
-            
-            if sc.change_type.endswith('_added'):
-                change_groups[change_type]['added'].append(sc.element_name)
-            elif sc.change_type.endswith('_removed'):
-                change_groups[change_type]['removed'].append(sc.element_name)
-            elif sc.change_type.endswith('_modified'):
-                change_groups[change_type]['modified'].append(sc.element_name)
-        
-        descriptions = []
-        for change_type, changes in change_groups.items():
-            type_descriptions = []
-            
-            if changes['added']:
-                if len(changes['added']) == 1:
-                    type_descriptions.append(f"added {change_type} {changes['added'][0]}")
-                else:
-                    type_descriptions.append(f"added {len(changes['added'])} {change_type}s")
-            
-            if changes['removed']:
-                if len(changes['removed']) == 1:
-                    type_descriptions.append(f"removed {change_type} {changes['removed'][0]}")
-                else:
-                    type_descriptions.append(f"removed {len(changes['removed'])} {change_type}s")
-            
-            if changes['modified']:
-                if len(changes['modified']) == 1:
-                    type_descriptions.append(f"modified {change_type} {changes['modified'][0]}")
-                else:
-                    type_descriptions.append(f"modified {len(changes['modified'])} {change_type}s")
-            
-            if type_descriptions:
-                descriptions.append(', '.join(type_descriptions))
-        
-        return '; '.join(descriptions) if descriptions else ""
\ No newline at end of file
+        footprint = tuple((sc.change_type, sc.element_name) for sc in structural_changes)
+        return _describe_footprint(footprint)
\ No newline at end of file
@@ -2,19 +2,59 @@
 Data models for the code change summarizer.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+from dataclasses import MISSING, dataclass, field, fields
+from typing import ClassVar, Counter, List, Optional, Tuple
 
 
-@dataclass
+def _add_slots(cls):
+    """Recreate a dataclass with ``__slots__`` for its fields.
+    
+    Backport of ``dataclass(slots=True)`` for Python < 3.10: the slot
+    descriptors replace the field defaults stored on the class. Before 3.10
+    the generated ``__init__`` leaves ``init=False`` fields with a plain
+    default to that class attribute, so such fields must use a
+    ``default_factory`` instead.
+    """
+    for f in fields(cls):
+        if not f.init and f.default is not MISSING:
+            raise TypeError(f"{cls.__name__}.{f.name}: init=False fields need a default_factory to be slotted")
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+def _slotted_dataclass(cls):
+    """Apply ``@dataclass`` and give the class ``__slots__`` on every supported Python.
+    
+    Slotted models drop the per-instance ``__dict__``, which matters for the
+    DiffLine and Hunk objects created in bulk while parsing and analyzing
+    large diffs.
+    """
+    if sys.version_info >= (3, 10):
+        return dataclass(slots=True)(cls)
+    return _add_slots(dataclass(cls))
+
+
+@_slotted_dataclass
 class DiffLine:
     """Represents a single line in a diff."""
-    line_type: str  # '+', '-', ' '
+    line_type: str  # ADDED, REMOVED or CONTEXT
     content: str
     line_number: Optional[int] = None
+    
+    # Shared line_type values; always compare against these rather than new strings
+    ADDED: ClassVar[str] = sys.intern('+')
+    REMOVED: ClassVar[str] = sys.intern('-')
+    CONTEXT: ClassVar[str] = sys.intern(' ')
 
 
-@dataclass
+@_slotted_dataclass
 class Hunk:
     """Represents a hunk (section of changes) in a diff."""
     old_start: int
@@ -23,25 +63,30 @@ class Hunk:
     new_count: int
     lines: List[DiffLine]
     context: str = ""
+    # Tallies of '+' and '-' lines, filled in by DiffParser so callers need
+    # not rescan lines; hunks built by hand keep the zero defaults
+    lines_added: int = 0
+    lines_removed: int = 0
 
 
-@dataclass
+@_slotted_dataclass
 class FileChange:
     """Represents changes to a single file."""
     filename: str
     change_type: str  # 'modified', 'added', 'deleted', 'renamed'
     old_filename: Optional[str] = None
-    hunks: List[Hunk] = None
+    hunks: List[Hunk] = field(default_factory=list)
     language: str = "unknown"
     lines_added: int = 0
     lines_removed: int = 0
     
     def __post_init__(self):
+        # Callers may still pass None explicitly
         if self.hunks is None:
             self.hunks = []
 
 
-@dataclass
+@_slotted_dataclass
 class StructuralChange:
     """Represents a structural change in code (function, class, etc.)."""
     change_type: str  # 'function_added', 'class_modified', 'import_changed'
@@ -49,9 +94,14 @@ class StructuralChange:
     description: str
     before: Optional[str] = None
     after: Optional[str] = None
+    # Derived from element_name: leading underscore marks a private element
+    is_private: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.is_private = self.element_name.startswith('_')
 
 
-@dataclass
+@_slotted_dataclass
 class AnalyzedChange:
     """Represents an analyzed file change with inferred context."""
     file_change: FileChange
@@ -65,7 +115,7 @@ class AnalyzedChange:
             self.structural_changes = []
 
 
-@dataclass
+@_slotted_dataclass
 class ChangeStatistics:
     """Statistics about the changes."""
     total_files: int = 0
@@ -76,7 +126,25 @@ class ChangeStatistics:
     total_lines_removed: int = 0
 
 
-@dataclass
+@_slotted_dataclass
+class ChangeAggregate:
+    """Statistics and per-file findings collected across all analyzed changes."""
+    statistics: ChangeStatistics
+    purpose_counts: Counter[str]
+    high_complexity: List[str]
+    new_files: List[str]
+    deleted_files: List[str]
+    large_changes: List[Tuple[str, int]]  # (filename, lines changed)
+    multi_class_files: List[str]
+    test_file_count: int = 0
+    total_lines_changed: int = 0
+    has_doc_changes: bool = False
+    has_new_features: bool = False
+    has_api_changes: bool = False
+    has_dependency_changes: bool = False
+
+
+@_slotted_dataclass
 class FileSummary:
     """Summary of changes for a single file."""
     filename: str
@@ -88,16 +156,17 @@ class FileSummary:
             self.key_changes = []
 
 
-@dataclass
+@_slotted_dataclass
 class Summary:
     """Complete summary of all changes."""
     overview: str
-    file_summaries: List[FileSummary] = None
-    statistics: ChangeStatistics = None
-    key_changes: List[str] = None
-    recommendations: List[str] = None
+    file_summaries: List[FileSummary] = field(default_factory=list)
+    statistics: ChangeStatistics = field(default_factory=ChangeStatistics)
+    key_changes: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
     
     def __post_init__(self):
+        # Callers may still pass None explicitly
         if self.file_summaries is None:
             self.file_summaries = []
         if self.key_changes is None:
@@ -4,28 +4,50 @@ Git diff parser module.
 
 import re
 import logging
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from .models import FileChange, Hunk, DiffLine
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Hunk line prefix -> (line_type, prefix length, old line step, new line step).
+# Added lines are numbered in the new file, everything else in the old one.
+_HUNK_LINE_KINDS = {
+    '+': (DiffLine.ADDED, 1, 0, 1),
+    '-': (DiffLine.REMOVED, 1, 1, 0),
+    ' ': (DiffLine.CONTEXT, 1, 1, 1),
+}
+_UNPREFIXED_LINE = (DiffLine.CONTEXT, 0, 1, 1)
+# Lines that end a hunk: the next hunk header or the next file
+_HUNK_END_PREFIXES = ('@@', 'diff --git')
+
 
 class DiffParser:
     """Parses git diff format and extracts file changes."""
     
-    def __init__(self):
-        # Regex patterns for parsing git diff
-        self.file_header_pattern = re.compile(r'^diff --git a/(.*?) b/(.*?)$')
-        self.old_file_pattern = re.compile(r'^--- a/(.*)$|^--- /dev/null$')
-        self.new_file_pattern = re.compile(r'^\+\+\+ b/(.*)$|^\+\+\+ /dev/null$')
-        self.hunk_header_pattern = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$')
-        self.rename_pattern = re.compile(r'^rename from (.*)$')
-        self.rename_to_pattern = re.compile(r'^rename to (.*)$')
+    # Regex patterns for parsing git diff, compiled once and shared by all instances
+    file_header_pattern = re.compile(r'^diff --git a/(.*?) b/(.*?)$')
+    old_file_pattern = re.compile(r'^--- a/(.*)$|^--- /dev/null$')
+    new_file_pattern = re.compile(r'^\+\+\+ b/(.*)$|^\+\+\+ /dev/null$')
+    hunk_header_pattern = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$')
+    rename_pattern = re.compile(r'^rename from (.*)$')
+    rename_to_pattern = re.compile(r'^rename to (.*)$')
+    # Classifies a file metadata line in one match; lastgroup names the kind
+    metadata_pattern = re.compile(
+        r'(?P<end>@@|diff --git)'
+        r'|rename from (?P<rename_from>.*)'
+        r'|rename to (?P<rename_to>.*)'
+        r'|(?P<added>new file mode)'
+        r'|(?P<deleted>deleted file mode)'
+    )
+    # Bound match methods for the patterns used while parsing
+    _match_file_header = file_header_pattern.match
+    _match_hunk_header = hunk_header_pattern.match
+    _match_metadata = metadata_pattern.match
     
     def parse_diff(self, diff_text: str) -> List[FileChange]:
         """Parse git diff text and return list of file changes."""
-        if not diff_text or not diff_text.strip():
+        if not diff_text or diff_text.isspace():
             logger.debug("Empty diff text provided")
             return []
         
@@ -33,73 +55,71 @@ class DiffParser:
             lines = diff_text.split('\n')
             file_changes = []
             current_file = None
-            i = 0
             
-            logger.debug(f"Parsing diff with {len(lines)} lines")
+            logger.debug("Parsing diff with %s lines", len(lines))
             
-            while i < len(lines):
-                line = lines[i]
-                
+            # Walk the lines once; hunk and metadata parsing hand back the first
+            # line they did not consume so it is dispatched here next
+            remaining = iter(lines)
+            match_metadata = self._match_metadata
+            line = next(remaining, None)
+            while line is not None:
                 # Check for file header
                 if line.startswith('diff --git'):
                     if current_file:
                         file_changes.append(current_file)
                     
                     current_file = self._parse_file_header(line)
-                    i += 1
                     
-                    # Parse additional file metadata
-                    while i < len(lines) and not lines[i].startswith('@@') and not lines[i].startswith('diff --git'):
-                        if lines[i].startswith('rename from'):
-                            match = self.rename_pattern.match(lines[i])
-                            if match:
-                                current_file.old_filename = match.group(1)
-                                current_file.change_type = 'renamed'
-                        elif lines[i].startswith('rename to'):
-                            match = self.rename_to_pattern.match(lines[i])
-                            if match:
-                                current_file.filename = match.group(1)
-                        elif lines[i].startswith('new file mode'):
+                    # Parse additional file metadata up to the first hunk or next file;
+                    # anything unrecognised (index, ---, +++, ...) is skipped
+                    for line in remaining:
+                        match = match_metadata(line)
+                        if match is None:
+                            continue
+                        kind = match.lastgroup
+                        if kind == 'end':
+                            break
+                        if kind == 'rename_from':
+                            current_file.old_filename = match.group(kind)
+                            current_file.change_type = 'renamed'
+                        elif kind == 'rename_to':
+                            current_file.filename = match.group(kind)
+                        elif kind == 'added':
                             current_file.change_type = 'added'
-                        elif lines[i].startswith('deleted file mode'):
+                        else:
                             current_file.change_type = 'deleted'
-                        elif lines[i].startswith('---') or lines[i].startswith('+++'):
-                            pass  # Skip these for now
-                        i += 1
+                    else:
+                        line = None
                     continue
                 
                 # Check for hunk header
                 elif line.startswith('@@') and current_file:
-                    try:
-                        hunk, lines_processed = self._parse_hunk(lines[i:])
-                        if hunk:
-                            current_file.hunks.append(hunk)
-                            current_file.lines_added += sum(1 for l in hunk.lines if l.line_type == '+')
-                            current_file.lines_removed += sum(1 for l in hunk.lines if l.line_type == '-')
-                        i += lines_processed
-                    except Exception as e:
-                        logger.warning(f"Failed to parse hunk at line {i}: {e}")
-                        i += 1
+                    hunk, line = self._parse_hunk_stream(line, remaining)
+                    if hunk:
+                        current_file.hunks.append(hunk)
+                        current_file.lines_added += hunk.lines_added
+                        current_file.lines_removed += hunk.lines_removed
                     continue
                 
-                i += 1
+                line = next(remaining, None)
             
             # Add the last file if exists
             if current_file:
                 file_changes.append(current_file)
             
-            logger.debug(f"Successfully parsed {len(file_changes)} file changes")
+            logger.debug("Successfully parsed %s file changes", len(file_changes))
             return file_changes
             
         except Exception as e:
-            logger.error(f"Error parsing diff: {e}")
+            logger.error("Error parsing diff: %s", e)
             # Return empty list instead of raising exception for robustness
             return []
     
     def _parse_file_header(self, line: str) -> FileChange:
         """Parse file header line and create FileChange object."""
         try:
-            match = self.file_header_pattern.match(line)
+            match = self._match_file_header(line)
             if match:
                 old_file = match.group(1)
                 new_file = match.group(2)
@@ -111,11 +131,11 @@ class DiffParser:
                     return FileChange(filename=new_file, change_type='renamed', old_filename=old_file)
             
             # Fallback for malformed headers
-            logger.warning(f"Could not parse file header: {line}")
+            logger.warning("Could not parse file header: %s", line)
             return FileChange(filename='unknown', change_type='modified')
             
         except Exception as e:
-            logger.error(f"Error parsing file header '{line}': {e}")
+            logger.error("Error parsing file header '%s': %s", line, e)
             return FileChange(filename='unknown', change_type='modified')
     
     def _parse_hunk(self, lines: List[str]) -> Tuple[Optional[Hunk], int]:
@@ -123,12 +143,23 @@ class DiffParser:
         if not lines or not lines[0].startswith('@@'):
             return None, 0
         
+        remaining = iter(lines)
+        hunk, _ = self._parse_hunk_stream(next(remaining), remaining)
+        return hunk, (1 + len(hunk.lines) if hunk else 1)
+    
+    def _parse_hunk_stream(self, header: str, remaining: Iterator[str]) -> Tuple[Optional[Hunk], Optional[str]]:
+        """Parse a hunk body from an iterator of lines, given its already-read header.
+        
+        Returns the hunk (None if it could not be parsed) and the next line
+        from ``remaining`` that does not belong to it, or None once the
+        iterator is exhausted.
+        """
         try:
             # Parse hunk header
-            match = self.hunk_header_pattern.match(lines[0])
+            match = self._match_hunk_header(header)
             if not match:
-                logger.warning(f"Invalid hunk header: {lines[0]}")
-                return None, 1
+                logger.warning("Invalid hunk header: %s", header)
+                return None, next(remaining, None)
             
             old_start = int(match.group(1))
             old_count = int(match.group(2)) if match.group(2) else 1
@@ -138,90 +169,76 @@ class DiffParser:
             
             # Parse hunk lines
             hunk_lines = []
-            i = 1
             old_line_num = old_start
             new_line_num = new_start
+            next_line = None
             
-            while i < len(lines):
-                line = lines[i]
-                
+            for line in remaining:
                 # Stop if we hit another hunk or file
-                if line.startswith('@@') or line.startswith('diff --git'):
+                if line.startswith(_HUNK_END_PREFIXES):
+                    next_line = line
                     break
                 
-                # Parse diff line
-                try:
-                    if line.startswith('+'):
-                        diff_line = DiffLine(line_type='+', content=line[1:], line_number=new_line_num)
-                        new_line_num += 1
-                    elif line.startswith('-'):
-                        diff_line = DiffLine(line_type='-', content=line[1:], line_number=old_line_num)
-                        old_line_num += 1
-                    elif line.startswith(' '):
-                        diff_line = DiffLine(line_type=' ', content=line[1:], line_number=old_line_num)
-                        old_line_num += 1
-                        new_line_num += 1
-                    else:
-                        # Handle lines that don't start with +, -, or space (context lines)
-                        diff_line = DiffLine(line_type=' ', content=line, line_number=old_line_num)
-                        old_line_num += 1
-                        new_line_num += 1
-                    
-                    hunk_lines.append(diff_line)
-                except Exception as e:
-                    logger.warning(f"Error parsing diff line '{line}': {e}")
-                    # Continue processing other lines
-                
-                i += 1
-            
+                # Parse diff line; lines without a +, - or space prefix are kept whole as context
+                line_type, prefix_len, old_step, new_step = _HUNK_LINE_KINDS.get(line[:1], _UNPREFIXED_LINE)
+                hunk_lines.append(DiffLine(
+                    line_type=line_type,
+                    content=line[prefix_len:],
+                    line_number=old_line_num if old_step else new_line_num
+                ))
+                old_line_num += old_step
+                new_line_num += new_step
+            
+            # Every line advances the old side, the new side or both, so the
+            # added and removed tallies fall out of the line counters
+            line_total = len(hunk_lines)
             hunk = Hunk(
                 old_start=old_start,
                 old_count=old_count,
                 new_start=new_start,
                 new_count=new_count,
                 lines=hunk_lines,
-                context=context
+                context=context,
+                lines_added=line_total - (old_line_num - old_start),
+                lines_removed=line_total - (new_line_num - new_start)
             )
             
-            return hunk, i
+            return hunk, next_line
             
         except Exception as e:
-            logger.error(f"Error parsing hunk: {e}")
-            return None, 1
+            logger.error("Error parsing hunk: %s", e)
+            return None, next(remaining, None)
     
     def extract_hunks(self, diff_section: str) -> List[Hunk]:
         """Extract hunks from a diff section."""
-        if not diff_section or not diff_section.strip():
+        if not diff_section or diff_section.isspace():
             return []
         
         try:
-            lines = diff_section.split('\n')
             hunks = []
-            i = 0
+            remaining = iter(diff_section.split('\n'))
+            line = next(remaining, None)
             
-            while i < len(lines):
-                if lines[i].startswith('@@'):
-                    hunk, lines_processed = self._parse_hunk(lines[i:])
+            while line is not None:
+                if line.startswith('@@'):
+                    hunk, line = self._parse_hunk_stream(line, remaining)
                     if hunk:
                         hunks.append(hunk)
-                    i += lines_processed
                 else:
-                    i += 1
+                    line = next(remaining, None)
             
             return hunks
             
         except Exception as e:
-            logger.error(f"Error extracting hunks: {e}")
+            logger.error("Error extracting hunks: %s", e)
             return []
     
     def validate_diff_format(self, diff_text: str) -> bool:
         """Validate if the input looks like a git diff."""
-        if not diff_text or not diff_text.strip():
+        if not diff_text or diff_text.isspace():
             return False
         
-        # Check for basic git diff markers
-        has_diff_header = 'diff --git' in diff_text
-        has_file_markers = ('---' in diff_text and '+++' in diff_text)
-        has_hunk_markers = '@@' in diff_text
-        
-        return has_diff_header or (has_file_markers and has_hunk_markers)
\ No newline at end of file
+        # Check for basic git diff markers, stopping at the first decisive one
+        if 'diff --git' in diff_text:
+            return True
+        return '@@' in diff_text and '---' in diff_text and '+++' in diff_text
\ No newline at end of file
@@ -2,8 +2,7 @@
 Setup script for Code Change Summarizer.
 """
 
-from setuptools import setup, find_packages
-import os
+from setuptools import setup
 
 # Read the README file
 with open("README.md", "r", encoding="utf-8") as fh:
@@ -11,7 +10,11 @@ with open("README.md", "r", encoding="utf-8") as fh:
 
 # Read requirements
 with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+    requirements = []
+    for raw_line in fh:
+        line = raw_line.strip()
+        if line and not line.startswith("#"):
+            requirements.append(line)
 
 setup(
     name="code-change-summarizer",
@@ -22,7 +25,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/your-org/code-change-summarizer",
-    packages=find_packages(),
+    packages=["code_summarizer"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -2,6 +2,7 @@
 Tests for code analyzer.
 """
 
+import time
 import unittest
 from code_summarizer.analyzer import CodeAnalyzer
 from code_summarizer.models import FileChange, Hunk, DiffLine
@@ -46,6 +47,20 @@ class TestCodeAnalyzer(unittest.TestCase):
         self.assertEqual(self.analyzer.detect_language('unknown.xyz'), 'unknown')
         self.assertEqual(self.analyzer.detect_language('noextension'), 'unknown')
     
+    def test_detect_language_extension_case_and_dots(self):
+        """Test extension lookup uses the last suffix, case-insensitively."""
+        self.assertEqual(self.analyzer.detect_language('Module.PY'), 'python')
+        self.assertEqual(self.analyzer.detect_language('bundle.min.js'), 'javascript')
+        self.assertEqual(self.analyzer.detect_language('release.v2/notes'), 'unknown')
+    
+    def test_detect_language_uses_base_name_in_paths(self):
+        """Test that special names and extensions are taken from the path's base name."""
+        self.assertEqual(self.analyzer.detect_language('release.v2/Makefile'), 'makefile')
+        self.assertEqual(self.analyzer.detect_language('docker/app/Dockerfile'), 'dockerfile')
+        self.assertEqual(self.analyzer.detect_language('services/api/.env'), 'config')
+        self.assertEqual(self.analyzer.detect_language('docs/README'), 'markdown')
+        self.assertEqual(self.analyzer.detect_language('src/lib.rs'), 'rust')
+    
     def test_parse_python_structure(self):
         """Test parsing Python code structure."""
         python_code = """
@@ -219,7 +234,105 @@ const variable = 42;
         self.assertEqual(structural_change.change_type, 'function_modified')
         self.assertEqual(structural_change.element_name, 'test_function')
         self.assertIn('Modified function', structural_change.description)
-    
+
+    def test_analyze_changes_modifications_follow_added_order(self):
+        """Test that modifications are reported in the order the new definitions appear."""
+        names = ['zeta', 'alpha', 'mid', 'beta', 'omega', 'gamma']
+        diff_lines = [DiffLine(line_type='-', content=f'def {name}():') for name in reversed(names)]
+        diff_lines += [DiffLine(line_type='+', content=f'def {name}(x):') for name in names]
+        diff_lines.append(DiffLine(line_type='+', content='def brand_new():'))
+        
+        hunk = Hunk(old_start=1, old_count=6, new_start=1, new_count=7, lines=diff_lines)
+        file_change = FileChange(filename='order.py', change_type='modified', hunks=[hunk])
+        
+        structural_changes = self.analyzer.analyze_changes([file_change])[0].structural_changes
+        
+        self.assertEqual(
+            [(sc.change_type, sc.element_name) for sc in structural_changes],
+            [('function_added', 'brand_new')] + [('function_modified', name) for name in names]
+        )
+
+    def test_analyze_changes_javascript_arrow_function_modified(self):
+        """Test that arrow functions and unnamed imports are handled in modification detection."""
+        diff_lines = [
+            DiffLine(line_type='-', content="import { a } from 'lib';"),
+            DiffLine(line_type='-', content='const handler = () => {'),
+            DiffLine(line_type='+', content="import { b } from 'lib';"),
+            DiffLine(line_type='+', content='const handler = (event) => {'),
+        ]
+
+        hunk = Hunk(old_start=1, old_count=2, new_start=1, new_count=2, lines=diff_lines)
+        file_change = FileChange(filename='app.js', change_type='modified', hunks=[hunk])
+
+        analyzed_change = self.analyzer.analyze_changes([file_change])[0]
+        change_types = {(sc.change_type, sc.element_name) for sc in analyzed_change.structural_changes}
+
+        self.assertNotEqual(analyzed_change.purpose_inference, "Analysis failed")
+        self.assertIn(('function_modified', 'handler'), change_types)
+        self.assertNotIn(('function_added', 'handler'), change_types)
+        self.assertIn(('import_added', 'anonymous'), change_types)
+        self.assertIn(('import_removed', 'anonymous'), change_types)
+
+    def test_analyze_changes_parallel_matches_serial(self):
+        """Test that the process pool path gives the same results in order."""
+        file_changes = []
+        for i in range(20):
+            hunk = Hunk(old_start=1, old_count=1, new_start=1, new_count=2, lines=[
+                DiffLine(line_type='+', content=f'def func_{i}():'),
+                DiffLine(line_type='-', content='# TODO: remove'),
+            ])
+            file_changes.append(FileChange(filename=f'mod_{i}.py', change_type='modified', hunks=[hunk]))
+
+        serial = self.analyzer.analyze_changes(file_changes)
+        parallel = CodeAnalyzer(max_workers=2).analyze_changes(file_changes)
+
+        self.assertEqual(len(parallel), 20)
+        for expected, actual in zip(serial, parallel):
+            self.assertEqual(actual.file_change.filename, expected.file_change.filename)
+            self.assertEqual(actual.structural_changes, expected.structural_changes)
+            self.assertEqual(actual.purpose_inference, expected.purpose_inference)
+            self.assertEqual(actual.complexity_score, expected.complexity_score)
+
+    def test_analyze_changes_reuses_cached_analysis(self):
+        """Test that unchanged files are answered from the cache on re-runs."""
+        analyzer = CodeAnalyzer(cache_size=8)
+        calls = []
+        original = analyzer._analyze_structural_changes
+        analyzer._analyze_structural_changes = lambda *args: calls.append(args) or original(*args)
+
+        def make_change(content):
+            hunk = Hunk(old_start=1, old_count=0, new_start=1, new_count=1, lines=[
+                DiffLine(line_type='+', content=content),
+            ])
+            return FileChange(filename='cached.py', change_type='modified', hunks=[hunk])
+
+        first = analyzer.analyze_changes([make_change('def cached():')])[0]
+        second = analyzer.analyze_changes([make_change('def cached():')])[0]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second.structural_changes, first.structural_changes)
+        self.assertEqual(second.purpose_inference, first.purpose_inference)
+        self.assertEqual(second.file_change.language, 'python')
+
+        analyzer.analyze_changes([make_change('def edited():')])
+        self.assertEqual(len(calls), 2)
+
+        analyzer.clear_cache()
+        analyzer.analyze_changes([make_change('def cached():')])
+        self.assertEqual(len(calls), 3)
+
+    def test_analyze_changes_skips_structure_above_max_file_size(self):
+        """Test that oversized changes skip structural parsing but are still analyzed."""
+        hunk = Hunk(old_start=1, old_count=0, new_start=1, new_count=1, lines=[
+            DiffLine(line_type='+', content='def big_function():'),
+        ])
+        file_change = FileChange(filename='big.py', change_type='modified', hunks=[hunk])
+
+        analyzed_change = CodeAnalyzer(max_file_size=10).analyze_changes([file_change])[0]
+
+        self.assertEqual(analyzed_change.structural_changes, [])
+        self.assertEqual(analyzed_change.file_change.language, 'python')
+        self.assertNotEqual(analyzed_change.purpose_inference, "Analysis failed")
+
     def test_analyze_changes_unknown_language(self):
         """Test analyzing changes for unknown language."""
         diff_lines = [
@@ -353,6 +466,37 @@ const variable = 42;
         self.assertIn('Public API changes', analyzed_change.impact_assessment)
         self.assertIn('Internal implementation changes', analyzed_change.impact_assessment)
     
+    def test_assess_change_impact_counts_and_kinds_in_order(self):
+        """Test element counts and class/import impacts in the assembled text."""
+        from code_summarizer.models import StructuralChange
+        structural_changes = [
+            StructuralChange(change_type='class_added', element_name='Widget', description=''),
+            StructuralChange(change_type='function_added', element_name='_helper', description=''),
+            StructuralChange(change_type='import_added', element_name='os', description=''),
+        ]
+        file_change = FileChange(filename='widget.rb', change_type='modified')
+
+        impact = self.analyzer._assess_change_impact(file_change, structural_changes)
+
+        self.assertEqual(impact, "Small-scale changes - low impact; "
+                                 "Public API changes (2 elements) - may affect external code; "
+                                 "Internal implementation changes (1 elements); "
+                                 "Class structure changes - may affect inheritance; "
+                                 "Dependency changes - may affect build process")
+    
+    def test_assess_change_impact_file_kinds(self):
+        """Test impact assessment by file kind, including test files."""
+        expected = {
+            'app.py': 'Core application code',
+            'app.spec.js': 'Test code',
+            'settings.yml': 'Configuration changes',
+            'NOTES.txt': 'Documentation changes',
+        }
+        for filename, impact in expected.items():
+            file_change = FileChange(filename=filename, change_type='modified')
+            analyzed_change = self.analyzer.analyze_changes([file_change])[0]
+            self.assertIn(impact, analyzed_change.impact_assessment)
+    
     def test_calculate_complexity_score_simple(self):
         """Test complexity score calculation for simple changes."""
         diff_lines = [
@@ -415,5 +559,116 @@ const variable = 42;
         # Deletions should have higher complexity score
         self.assertGreaterEqual(analyzed_change.complexity_score, 2)
 
+    def test_language_patterns_shared_between_instances(self):
+        """Test that compiled patterns are built once and shared."""
+        other = CodeAnalyzer()
+        self.assertIs(self.analyzer.language_patterns, other.language_patterns)
+        self.assertIsInstance(self.analyzer.language_patterns['python'], tuple)
+
+    def test_parse_structure_and_language_detection_do_not_compile(self):
+        """Test that structure parsing and language detection reuse precompiled state."""
+        from unittest.mock import patch
+        from code_summarizer.analyzer import _detect_language
+        
+        self.analyzer.detect_language('warm/module.py')
+        hits = _detect_language.cache_info().hits
+        with patch('code_summarizer.analyzer.re.compile', side_effect=AssertionError("compiled")):
+            for language in ('python', 'javascript', 'typescript', 'java', 'go', 'rust'):
+                self.analyzer.parse_code_structure("def f():\nclass A:\nimport os", language)
+            self.assertEqual(self.analyzer.detect_language('warm/module.py'), 'python')
+        self.assertEqual(_detect_language.cache_info().hits, hits + 1)
+
+    def test_parse_structure_line_matching_several_types(self):
+        """Test that one line can match several pattern types with correct line numbers."""
+        js_code = "// header\n\nconst handler = (event) => {\n    run(event) {\n"
+        structure = self.analyzer.parse_code_structure(js_code, 'javascript')
+
+        self.assertEqual(structure['function'][0]['line'], 3)
+        self.assertEqual(structure['variable'][0]['name'], 'handler')
+        self.assertEqual(structure['variable'][0]['line'], 3)
+        self.assertEqual(structure['method'][0]['name'], 'run')
+        self.assertEqual(structure['method'][0]['line'], 4)
+
+    def test_parse_structure_skips_overlong_lines(self):
+        """Test that minified or generated lines are not reported as elements."""
+        code = "bundle = '" + "x" * 5000 + "'\ndef after_bundle():"
+        structure = self.analyzer.parse_code_structure(code, 'python')
+
+        self.assertNotIn('variable', structure)
+        self.assertEqual(structure['function'][0]['name'], 'after_bundle')
+        self.assertEqual(structure['function'][0]['line'], 2)
+
+    def test_parse_structure_skips_long_whitespace_line_before_scanning(self):
+        """Test that a long whitespace line is dropped before the regex scan can backtrack on it."""
+        code = "class Bundle {\n" + " " * 50000 + "\n    private int count = 0;\n}"
+
+        start = time.perf_counter()
+        structure = self.analyzer.parse_code_structure(code, 'java')
+        elapsed = time.perf_counter() - start
+
+        # Scanning the line itself takes minutes
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(structure['class'][0]['name'], 'Bundle')
+        self.assertEqual(structure['variable'][0]['name'], 'count')
+        self.assertEqual(structure['variable'][0]['line'], 3)
+
+    def test_parse_structure_python_guards_match_fused_scanner(self):
+        """Test that the guarded Python parser agrees with the fused scanner."""
+        from code_summarizer.analyzer import _FUSED_PATTERNS, _make_structure_parser
+        fused = _make_structure_parser(*_FUSED_PATTERNS['python'])
+        code = (
+            "import os, sys\n"
+            "from pkg.mod import name as alias\n"
+            "\t@decorator(arg)\n"
+            "    def method(self, value=1):\n"
+            "class Base(object):\n"
+            "x=1\n"
+            "defined = True\n"
+            "classic == other\n"
+            "if value == 2:\n"
+            "\x0bresult = call()\n"
+        )
+
+        self.assertEqual(self.analyzer.parse_code_structure(code, 'python'), fused(code))
+
+    def test_parse_structure_does_not_match_across_lines(self):
+        """Test that patterns never span a newline."""
+        structure = self.analyzer.parse_code_structure("def broken(\n):\nimport\nos", 'python')
+        self.assertEqual(structure, {})
+    
+    def test_parse_batch_groups_elements_per_snippet(self):
+        """Test that batch parsing splits several same-type elements back per snippet."""
+        from code_summarizer.analyzer import _STRUCTURE_PARSERS, _parse_batch
+        parser = _STRUCTURE_PARSERS['javascript']
+        codes = [
+            "function a() {}\nfunction b() {}",
+            "let x = 1;",
+            "",
+            "class K {}\nfunction c() {}\nfunction d() {}",
+        ]
+        
+        self.assertEqual(_parse_batch(parser, codes), [parser(code) for code in codes])
+    
+    def test_analyze_changes_batched_parsing_matches_single_files(self):
+        """Test that parsing small changes together gives the same result as one file at a time."""
+        file_changes = []
+        for i, (extension, content) in enumerate([
+            ('py', 'def first(a):'), ('js', 'class Widget {'), ('py', 'class Second:'),
+            ('py', '    x = 1'), ('js', 'const render = () => {'), ('py', 'def big(): ' + 'x' * 5000),
+        ]):
+            hunk = Hunk(old_start=1, old_count=1, new_start=1, new_count=2, lines=[
+                DiffLine(line_type='-', content=f'def old_{i}():'),
+                DiffLine(line_type='+', content=content),
+                DiffLine(line_type='+', content='import os'),
+            ])
+            file_changes.append(FileChange(filename=f'mod_{i}.{extension}', change_type='modified', hunks=[hunk]))
+        
+        batched = self.analyzer.analyze_changes(file_changes)
+        
+        for file_change, actual in zip(file_changes, batched):
+            expected = CodeAnalyzer().analyze_changes([file_change])[0]
+            self.assertEqual(actual.structural_changes, expected.structural_changes)
+            self.assertEqual(actual.purpose_inference, expected.purpose_inference)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,21 +2,22 @@
 Tests for command-line interface.
 """
 
+import argparse
+import json
 import unittest
 import sys
 import io
 import tempfile
 import os
-from unittest.mock import patch, MagicMock
-from code_summarizer.cli import main, get_diff_input, process_diff, format_output, write_output
+import subprocess
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from code_summarizer.cli import (main, get_diff_input, process_diff, format_output, write_output,
+                                  stream_output, validate_args)
 
 
-class TestCLI(unittest.TestCase):
-    """Test cases for CLI functionality."""
-    
-    def setUp(self):
-        """Set up test fixtures."""
-        self.sample_diff = """diff --git a/test.py b/test.py
+# Sample diff shared by the tests
+_SAMPLE_DIFF = """diff --git a/test.py b/test.py
 index 1234567..abcdefg 100644
 --- a/test.py
 +++ b/test.py
@@ -26,37 +27,65 @@ index 1234567..abcdefg 100644
      return "hello"
  
 """
+
+
+class TestCLI(unittest.TestCase):
+    """Test cases for CLI functionality."""
+    
+    # Read-only format_output arguments, shared by the tests
+    ARGS_PLAIN = argparse.Namespace(format='plain', template=None, template_name=None)
+    ARGS_JSON = argparse.Namespace(format='json', template=None, template_name=None)
+    ARGS_MARKDOWN = argparse.Namespace(format='markdown', template=None, template_name=None)
+    ARGS_TEMPLATE = argparse.Namespace(format='plain', template='Files: {total_files}, Added: {lines_added}',
+                                       template_name=None)
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by all tests."""
+        cls.sample_diff = _SAMPLE_DIFF
+        # Formatting does not modify the summary, so one is shared by the format tests
+        cls.sample_summary = process_diff(cls.sample_diff, quiet=True)
+        
+        # One scratch directory per class, holding the sample diff as an input file
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.temp_dir = cls._temp_dir.name
+        cls.sample_diff_path = os.path.join(cls.temp_dir, 'sample.diff')
+        with open(cls.sample_diff_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(cls.sample_diff)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared scratch directory."""
+        cls._temp_dir.cleanup()
     
     def test_get_diff_input_from_string(self):
         """Test getting diff input from string argument."""
-        args = MagicMock()
-        args.diff = self.sample_diff
-        args.input = None
+        args = argparse.Namespace(diff=self.sample_diff, input=None)
         
         result = get_diff_input(args)
         self.assertEqual(result, self.sample_diff)
     
     def test_get_diff_input_from_file(self):
         """Test getting diff input from file."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.diff') as f:
-            f.write(self.sample_diff)
-            temp_file = f.name
-        
-        try:
-            args = MagicMock()
-            args.diff = None
-            args.input = temp_file
-            
-            result = get_diff_input(args)
-            self.assertEqual(result, self.sample_diff)
-        finally:
-            os.unlink(temp_file)
+        args = argparse.Namespace(diff=None, input=self.sample_diff_path)
+        
+        result = get_diff_input(args)
+        self.assertEqual(result, self.sample_diff)
+    
+    def test_get_diff_input_from_latin1_crlf_file(self):
+        """Test that non-UTF-8 files fall back to latin-1 with newlines normalized."""
+        temp_file = os.path.join(self.temp_dir, 'latin1_crlf.diff')
+        with open(temp_file, 'wb') as f:
+            f.write('+caf\xe9\r\n-old\r\n'.encode('latin-1'))
+        
+        args = argparse.Namespace(diff=None, input=temp_file)
+        
+        result = get_diff_input(args)
+        self.assertEqual(result, '+caf\xe9\n-old\n')
     
     def test_get_diff_input_file_not_found(self):
         """Test error handling for non-existent input file."""
-        args = MagicMock()
-        args.diff = None
-        args.input = 'non_existent_file.diff'
+        args = argparse.Namespace(diff=None, input='non_existent_file.diff')
         
         with self.assertRaises(FileNotFoundError):
             get_diff_input(args)
@@ -67,13 +96,27 @@ index 1234567..abcdefg 100644
         mock_stdin.read.return_value = self.sample_diff
         mock_stdin.isatty.return_value = False
         
-        args = MagicMock()
-        args.diff = None
-        args.input = None
+        args = argparse.Namespace(diff=None, input=None)
         
         result = get_diff_input(args)
         self.assertEqual(result, self.sample_diff)
     
+    def test_get_diff_input_from_binary_stdin(self):
+        """Test that a real text stdin is read through its binary buffer."""
+        stdin = io.TextIOWrapper(io.BytesIO(self.sample_diff.encode('utf-8')), encoding='utf-8')
+        
+        args = argparse.Namespace(diff=None, input=None)
+        
+        with patch('sys.stdin', stdin):
+            result = get_diff_input(args)
+        self.assertEqual(result, self.sample_diff)
+        
+        # Undecodable input is reported as before
+        stdin = io.TextIOWrapper(io.BytesIO(b'\xff\xfe'), encoding='utf-8')
+        with patch('sys.stdin', stdin):
+            with self.assertRaises(ValueError):
+                get_diff_input(args)
+    
     def test_process_diff_success(self):
         """Test successful diff processing."""
         summary = process_diff(self.sample_diff, quiet=True)
@@ -83,6 +126,34 @@ index 1234567..abcdefg 100644
         self.assertEqual(summary.statistics.files_modified, 1)
         self.assertGreater(summary.statistics.total_lines_added, 0)
     
+    def test_main_passes_jobs_to_analyzer(self):
+        """Test that --jobs sets the analyzer's worker count, 0 meaning one per CPU."""
+        with patch('code_summarizer.analyzer.CodeAnalyzer.__init__', return_value=None) as mock_init, \
+                patch('code_summarizer.analyzer.CodeAnalyzer.analyze_changes', return_value=[]):
+            with patch('sys.argv', ['cli.py', '--diff', self.sample_diff, '--quiet', '--jobs', '3']), \
+                    patch('sys.stdout', new_callable=io.StringIO):
+                self.assertEqual(main(), 0)
+            self.assertEqual(mock_init.call_args.kwargs['max_workers'], 3)
+            
+            with patch('os.cpu_count', return_value=6):
+                process_diff(self.sample_diff, quiet=True, jobs=0)
+            self.assertEqual(mock_init.call_args.kwargs['max_workers'], 6)
+    
+    def test_process_diff_ignores_invalid_settings(self):
+        """Test that invalid max_file_size and jobs settings fall back to the defaults."""
+        from code_summarizer.config import config
+        for max_file_size in ('big', -5, 0):
+            with self.subTest(max_file_size=max_file_size), \
+                    patch.dict(config.config, {'max_file_size': max_file_size}):
+                summary = process_diff(self.sample_diff, quiet=True, jobs='four')
+                self.assertNotIn('Analysis failed', summary.file_summaries[0].summary)
+        
+        with patch('code_summarizer.analyzer.CodeAnalyzer.__init__', return_value=None) as mock_init, \
+                patch('code_summarizer.analyzer.CodeAnalyzer.analyze_changes', return_value=[]), \
+                patch.dict(config.config, {'max_file_size': 'big'}):
+            process_diff(self.sample_diff, quiet=True, jobs=-2)
+        self.assertEqual(mock_init.call_args.kwargs, {'max_workers': 1, 'max_file_size': None})
+    
     def test_process_diff_empty(self):
         """Test processing empty diff."""
         summary = process_diff("", quiet=True)
@@ -95,62 +166,32 @@ index 1234567..abcdefg 100644
         result = process_diff("invalid diff content", quiet=True)
         self.assertIsNone(result)
     
-    def test_format_output_plain(self):
-        """Test formatting output as plain text."""
-        summary = process_diff(self.sample_diff, quiet=True)
-        
-        args = MagicMock()
-        args.format = 'plain'
-        args.template = None
-        args.template_name = None
-        
-        result = format_output(summary, args)
-        
-        self.assertIn('CODE CHANGE SUMMARY', result)
-        self.assertIn('OVERVIEW:', result)
-        self.assertIn('test.py', result)
-    
-    def test_format_output_json(self):
-        """Test formatting output as JSON."""
-        summary = process_diff(self.sample_diff, quiet=True)
-        
-        args = MagicMock()
-        args.format = 'json'
-        args.template = None
-        args.template_name = None
-        
-        result = format_output(summary, args)
-        
-        # Should be valid JSON
-        import json
-        data = json.loads(result)
-        self.assertIn('overview', data)
-        self.assertIn('statistics', data)
-    
-    def test_format_output_markdown(self):
-        """Test formatting output as Markdown."""
-        summary = process_diff(self.sample_diff, quiet=True)
-        
-        args = MagicMock()
-        args.format = 'markdown'
-        args.template = None
-        args.template_name = None
-        
-        result = format_output(summary, args)
-        
-        self.assertIn('# Code Change Summary', result)
-        self.assertIn('## Overview', result)
-        self.assertIn('### test.py', result)
+    def test_format_output_formats(self):
+        """Test formatting output as plain text, JSON and Markdown."""
+        cases = [
+            (self.ARGS_PLAIN, ['CODE CHANGE SUMMARY', 'OVERVIEW:', 'test.py']),
+            (self.ARGS_JSON, []),
+            (self.ARGS_MARKDOWN, ['# Code Change Summary', '## Overview', '### test.py']),
+        ]
+        
+        for args, expected in cases:
+            with self.subTest(format=args.format):
+                result = format_output(self.sample_summary, args)
+                
+                for text in expected:
+                    self.assertIn(text, result)
+                
+                if args.format == 'json':
+                    # Should be valid JSON
+                    data = json.loads(result)
+                    self.assertIn('overview', data)
+                    self.assertIn('statistics', data)
     
     def test_format_output_template(self):
         """Test formatting output with custom template."""
-        summary = process_diff(self.sample_diff, quiet=True)
-        
-        args = MagicMock()
-        args.format = 'plain'
-        args.template = 'Files: {total_files}, Added: {lines_added}'
+        summary = self.sample_summary
         
-        result = format_output(summary, args)
+        result = format_output(summary, self.ARGS_TEMPLATE)
         
         self.assertIn('Files: 1', result)
         self.assertIn('Added:', result)
@@ -159,26 +200,86 @@ index 1234567..abcdefg 100644
         """Test writing output to stdout."""
         output_text = "Test output"
         
-        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
             write_output(output_text, None)
-            self.assertEqual(mock_stdout.getvalue().strip(), output_text)
+        self.assertEqual(buffer.getvalue().strip(), output_text)
+    
+    def test_write_output_redirected_stdout(self):
+        """Test writing output to a redirected stdout through its binary buffer."""
+        buffer = io.BytesIO()
+        stdout = io.TextIOWrapper(buffer, encoding='utf-8')
+        stdout.write("Header\n")
+        
+        with patch('sys.stdout', stdout):
+            write_output("Caf\u00e9 output", None)
+        
+        self.assertEqual(buffer.getvalue().decode('utf-8'), "Header\nCaf\u00e9 output\n")
     
     def test_write_output_file(self):
         """Test writing output to file."""
         output_text = "Test output"
+        temp_file = os.path.join(self.temp_dir, 'write_output.txt')
         
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
-            temp_file = f.name
+        write_output(output_text, temp_file)
         
-        try:
-            write_output(output_text, temp_file)
-            
-            with open(temp_file, 'r') as f:
-                result = f.read()
-            
-            self.assertEqual(result, output_text)
-        finally:
-            os.unlink(temp_file)
+        with open(temp_file, 'r') as f:
+            result = f.read()
+        
+        self.assertEqual(result, output_text)
+    
+    def test_main_streams_output_file(self):
+        """Test that --output receives the same text format_output would return."""
+        temp_file = os.path.join(self.temp_dir, 'streamed.md')
+        
+        argv = ['cli.py', '--diff', self.sample_diff, '--format', 'markdown', '--output', temp_file, '--quiet']
+        with patch('sys.argv', argv):
+            self.assertEqual(main(), 0)
+        
+        expected = format_output(self.sample_summary, self.ARGS_MARKDOWN)
+        
+        with open(temp_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), expected)
+    
+    def test_stream_output_failure_keeps_existing_file(self):
+        """Test that a formatting error leaves an existing output file and no temporary file."""
+        output_dir = os.path.join(self.temp_dir, 'stream_failure')
+        os.mkdir(output_dir)
+        temp_file = os.path.join(output_dir, 'summary.json')
+        with open(temp_file, 'w') as f:
+            f.write('previous output')
+        os.chmod(temp_file, 0o640)
+        
+        from code_summarizer.formatter import OutputFormatter
+        args = argparse.Namespace(format='json', output=temp_file)
+        failing = {'json': lambda formatter, summary, write: (write('{"partial'), 1 / 0)}
+        with patch.dict(OutputFormatter._FORMAT_METHODS, failing):
+            with self.assertRaises(RuntimeError):
+                stream_output(self.sample_summary, args)
+        
+        with open(temp_file, 'r') as f:
+            self.assertEqual(f.read(), 'previous output')
+        self.assertEqual(os.listdir(output_dir), ['summary.json'])
+        
+        # A successful run replaces the file but keeps its permissions
+        stream_output(self.sample_summary, args)
+        with open(temp_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.loads(f.read())['overview'], self.sample_summary.overview)
+        self.assertEqual(os.stat(temp_file).st_mode & 0o777, 0o640)
+        self.assertEqual(os.listdir(output_dir), ['summary.json'])
+    
+    def test_validate_args_keeps_existing_output_file(self):
+        """Test that validating the output path does not truncate or remove an existing file."""
+        temp_file = os.path.join(self.temp_dir, 'existing_output.txt')
+        with open(temp_file, 'w') as f:
+            f.write('previous output')
+    
+        args = argparse.Namespace(format='plain', template=None, output=temp_file)
+        
+        validate_args(args)
+        
+        with open(temp_file, 'r') as f:
+            self.assertEqual(f.read(), 'previous output')
     
     @patch('sys.argv', ['cli.py', '--version'])
     def test_version_argument(self):
@@ -198,6 +299,64 @@ index 1234567..abcdefg 100644
         # argparse exits with code 0 for --help
         self.assertEqual(context.exception.code, 0)
     
+    def test_help_skips_heavy_imports(self):
+        """Test that --help does not load configuration or the analysis modules."""
+        script = (
+            "import sys\n"
+            "from code_summarizer.cli import main\n"
+            "sys.argv = ['cli.py', '--help']\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "loaded = [name for name in ('parser', 'analyzer', 'generator', 'formatter', 'config')\n"
+            "          if 'code_summarizer.' + name in sys.modules]\n"
+            "sys.stderr.write(','.join(loaded))\n"
+        )
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-c', script], cwd=project_root,
+                                capture_output=True, text=True)
+        
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stderr, '')
+
+    def test_config_import_skips_formatter(self):
+        """Test that loading the configuration does not import the formatter."""
+        script = (
+            "import sys\n"
+            "from code_summarizer.config import Config\n"
+            "Config()\n"
+            "sys.stderr.write(str('code_summarizer.formatter' in sys.modules))\n"
+        )
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-c', script], cwd=project_root,
+                                capture_output=True, text=True)
+    
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stderr, 'False')
+    
+    @patch('sys.argv', ['cli.py', '--list-templates'])
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_list_templates_skips_full_parser(self, mock_stdout):
+        """Test that configuration-only commands do not build the full argument parser."""
+        with patch('code_summarizer.cli._build_full_parser') as mock_build:
+            result = main()
+        
+        self.assertEqual(result, 0)
+        mock_build.assert_not_called()
+    
+    @patch('sys.argv', ['cli.py', '--c'])
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_ambiguous_abbreviation_does_not_create_config(self, mock_stderr):
+        """Test that an abbreviated option is left to the full parser rather than run as --create-config."""
+        with patch('code_summarizer.config.Config.create_sample_config') as mock_create:
+            with self.assertRaises(SystemExit) as context:
+                main()
+        
+        self.assertEqual(context.exception.code, 2)
+        self.assertIn('ambiguous option', mock_stderr.getvalue())
+        mock_create.assert_not_called()
+    
     @patch('sys.argv', ['cli.py', '--diff', 'test diff'])
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_main_with_diff_argument(self, mock_stdout):
@@ -290,30 +449,14 @@ index 1234567..abcdefg 100644
         self.assertIsInstance(summary.key_changes, list)
         
         # Test different output formats
-        args_plain = MagicMock()
-        args_plain.format = 'plain'
-        args_plain.template = None
-        args_plain.template_name = None
-        
-        plain_output = format_output(summary, args_plain)
+        plain_output = format_output(summary, self.ARGS_PLAIN)
         self.assertIn('CODE CHANGE SUMMARY', plain_output)
         
-        args_json = MagicMock()
-        args_json.format = 'json'
-        args_json.template = None
-        args_json.template_name = None
-        
-        json_output = format_output(summary, args_json)
-        import json
+        json_output = format_output(summary, self.ARGS_JSON)
         json_data = json.loads(json_output)
         self.assertIn('overview', json_data)
         
-        args_md = MagicMock()
-        args_md.format = 'markdown'
-        args_md.template = None
-        args_md.template_name = None
-        
-        md_output = format_output(summary, args_md)
+        md_output = format_output(summary, self.ARGS_MARKDOWN)
         self.assertIn('# Code Change Summary', md_output)
 
 
@@ -2,20 +2,58 @@
 Tests for configuration system.
 """
 
+import copy
+import io
 import unittest
 import tempfile
 import os
 import json
+from contextlib import redirect_stdout
+from pathlib import Path
 from unittest.mock import patch
 from code_summarizer.config import Config
 
 
+class _ProjectConfig(Config):
+    """Config that reads its project configuration from the given file."""
+    
+    def __init__(self, project_path):
+        self._project_path = Path(project_path)
+        super().__init__()
+    
+    def _get_project_config_path(self) -> Path:
+        return self._project_path
+
+
 class TestConfig(unittest.TestCase):
     """Test cases for configuration system."""
     
+    # Environment overrides; patch.dict copies them into os.environ and never modifies them
+    ENV_VALID = {
+        'CODE_SUMMARIZER_FORMAT': 'json',
+        'CODE_SUMMARIZER_QUIET': 'true',
+        'CODE_SUMMARIZER_COMPLEXITY_THRESHOLD': '8',
+        'CODE_SUMMARIZER_JOBS': '4'
+    }
+    ENV_INVALID = {'CODE_SUMMARIZER_COMPLEXITY_THRESHOLD': 'invalid'}
+    
+    @classmethod
+    def setUpClass(cls):
+        """Load the configuration sources once for the whole class."""
+        cls._prototype = Config()
+        # Scratch directory for tests that write configuration files
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls.temp_dir = cls._temp_dir.name
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared scratch directory."""
+        cls._temp_dir.cleanup()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.config = Config()
+        # Each test gets its own copy, so settings changed by one never leak into another
+        self.config = copy.deepcopy(self._prototype)
     
     def test_default_config(self):
         """Test default configuration values."""
@@ -25,6 +63,11 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(self.config.get('complexity_threshold'), 5)
         self.assertIsInstance(self.config.get('supported_extensions'), list)
     
+    def test_config_uses_slots(self):
+        """Test that Config keeps its state in slots, without an instance __dict__."""
+        with self.assertRaises(AttributeError):
+            self.config.unknown_setting = 'value'
+    
     def test_get_set_config(self):
         """Test getting and setting configuration values."""
         # Test get with default
@@ -42,32 +85,60 @@ class TestConfig(unittest.TestCase):
         
         self.assertTrue(self.config.validate_config())
     
+    def test_validate_config_remembers_valid_settings(self):
+        """Test that a passed validation is reused until a validated setting changes."""
+        self.assertTrue(self.config.validate_config())
+        self.assertTrue(self.config.validate_config())
+        
+        # Same value, different type: must not reuse the earlier result
+        self.config.set('max_file_size', float(self.config.get('max_file_size')))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertFalse(self.config.validate_config())
+            self.assertFalse(self.config.validate_config())
+        self.assertEqual(output.getvalue().count('max_file_size must be'), 2)
+        
+        self.config.set('max_file_size', 1000)
+        self.assertTrue(self.config.validate_config())
+    
     def test_validate_config_invalid_format(self):
         """Test configuration validation with invalid format."""
         self.config.set('output_format', 'invalid_format')
         
-        with patch('builtins.print') as mock_print:
+        output = io.StringIO()
+        with redirect_stdout(output):
             result = self.config.validate_config()
-            self.assertFalse(result)
-            mock_print.assert_called()
+        self.assertFalse(result)
+        self.assertIn('Invalid output_format', output.getvalue())
     
     def test_validate_config_invalid_threshold(self):
         """Test configuration validation with invalid complexity threshold."""
         self.config.set('complexity_threshold', 15)  # Invalid: > 10
         
-        with patch('builtins.print') as mock_print:
+        output = io.StringIO()
+        with redirect_stdout(output):
             result = self.config.validate_config()
-            self.assertFalse(result)
-            mock_print.assert_called()
+        self.assertFalse(result)
+        self.assertIn('complexity_threshold must be', output.getvalue())
     
     def test_validate_config_invalid_file_size(self):
         """Test configuration validation with invalid file size."""
         self.config.set('max_file_size', -100)  # Invalid: negative
         
-        with patch('builtins.print') as mock_print:
+        output = io.StringIO()
+        with redirect_stdout(output):
             result = self.config.validate_config()
-            self.assertFalse(result)
-            mock_print.assert_called()
+        self.assertFalse(result)
+        self.assertIn('max_file_size must be', output.getvalue())
+    
+    def test_validate_config_invalid_jobs(self):
+        """Test configuration validation with a negative worker count."""
+        self.config.set('jobs', -1)
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertFalse(self.config.validate_config())
+        self.assertIn('jobs must be', output.getvalue())
     
     def test_custom_templates(self):
         """Test custom template functionality."""
@@ -88,51 +159,40 @@ class TestConfig(unittest.TestCase):
     
     def test_create_sample_config(self):
         """Test creating sample configuration file."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-            temp_file = f.name
+        # The class's private directory, so the path cannot be claimed by anyone else
+        temp_file = os.path.join(self.temp_dir, 'sample.json')
         
-        try:
-            # Remove the file so we can test creation
-            os.unlink(temp_file)
-            
-            with patch('builtins.print') as mock_print:
-                self.config.create_sample_config(temp_file)
-                mock_print.assert_called_with(f"Sample configuration created at: {temp_file}")
-            
-            # Verify file was created and contains valid JSON
-            self.assertTrue(os.path.exists(temp_file))
-            
-            with open(temp_file, 'r') as f:
-                sample_config = json.load(f)
-            
-            self.assertIn('output_format', sample_config)
-            self.assertIn('custom_templates', sample_config)
-            
-        finally:
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.config.create_sample_config(temp_file)
+        self.assertEqual(output.getvalue(), f"Sample configuration created at: {temp_file}\n")
+        
+        # Verify file was created and contains valid JSON
+        self.assertTrue(os.path.exists(temp_file))
+        
+        with open(temp_file, 'r') as f:
+            sample_config = json.load(f)
+        
+        self.assertIn('output_format', sample_config)
+        self.assertIn('custom_templates', sample_config)
     
     def test_environment_variable_loading(self):
         """Test loading configuration from environment variables."""
-        with patch.dict(os.environ, {
-            'CODE_SUMMARIZER_FORMAT': 'json',
-            'CODE_SUMMARIZER_QUIET': 'true',
-            'CODE_SUMMARIZER_COMPLEXITY_THRESHOLD': '8'
-        }):
+        with patch.dict(os.environ, self.ENV_VALID):
             config = Config()
             
             self.assertEqual(config.get('output_format'), 'json')
             self.assertEqual(config.get('quiet'), True)
             self.assertEqual(config.get('complexity_threshold'), 8)
+            self.assertEqual(config.get('jobs'), 4)
     
     def test_environment_variable_invalid_values(self):
         """Test handling of invalid environment variable values."""
-        with patch.dict(os.environ, {
-            'CODE_SUMMARIZER_COMPLEXITY_THRESHOLD': 'invalid'
-        }):
-            with patch('builtins.print') as mock_print:
-                config = Config()
-                mock_print.assert_called()
+        with patch.dict(os.environ, self.ENV_INVALID):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                Config()
+            self.assertIn('Invalid value for CODE_SUMMARIZER_COMPLEXITY_THRESHOLD', output.getvalue())
     
     def test_config_file_loading(self):
         """Test loading configuration from file."""
@@ -150,18 +210,26 @@ class TestConfig(unittest.TestCase):
             temp_file = f.name
         
         try:
-            # Mock the project config path to point to our temp file
-            from pathlib import Path
-            with patch.object(Config, '_get_project_config_path', return_value=Path(temp_file)):
-                config = Config()
-                
-                self.assertEqual(config.get('output_format'), 'markdown')
-                self.assertEqual(config.get('quiet'), True)
-                self.assertEqual(config.get('complexity_threshold'), 7)
-                self.assertEqual(config.get_template('test'), 'Test template: {overview}')
+            # Point the project config path at our temp file
+            config = _ProjectConfig(temp_file)
+            
+            self.assertEqual(config.get('output_format'), 'markdown')
+            self.assertEqual(config.get('quiet'), True)
+            self.assertEqual(config.get('complexity_threshold'), 7)
+            self.assertEqual(config.get_template('test'), 'Test template: {overview}')
         
         finally:
-            os.unlink(temp_file)
+            Path(temp_file).unlink(missing_ok=True)
+    
+    def test_config_file_values_not_shared_between_instances(self):
+        """Test that changing one Config's loaded values does not affect later instances."""
+        temp_file = os.path.join(self.temp_dir, 'shared.json')
+        with open(temp_file, 'w') as f:
+            json.dump({'custom_templates': {'brief': 'Files: {total_files}'}}, f)
+        
+        _ProjectConfig(temp_file).get('custom_templates')['added'] = 'Changed'
+        
+        self.assertEqual(_ProjectConfig(temp_file).get('custom_templates'), {'brief': 'Files: {total_files}'})
     
     def test_config_file_invalid_json(self):
         """Test handling of invalid JSON in config file."""
@@ -170,33 +238,30 @@ class TestConfig(unittest.TestCase):
             temp_file = f.name
         
         try:
-            from pathlib import Path
-            with patch.object(Config, '_get_project_config_path', return_value=Path(temp_file)):
-                with patch('builtins.print') as mock_print:
-                    config = Config()
-                    mock_print.assert_called()
+            output = io.StringIO()
+            with redirect_stdout(output):
+                _ProjectConfig(temp_file)
+            self.assertIn('Could not load project config', output.getvalue())
         
         finally:
-            os.unlink(temp_file)
+            Path(temp_file).unlink(missing_ok=True)
     
     def test_save_user_config(self):
         """Test saving user configuration."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            from pathlib import Path
-            config_file = Path(temp_dir) / 'config.json'
+        config_file = Path(self.temp_dir) / 'user' / 'config.json'
+        
+        with patch.object(Config, '_get_user_config_path', return_value=config_file):
+            self.config.set('test_setting', 'test_value')
+            self.config.save_user_config()
+            
+            # Verify file was created
+            self.assertTrue(config_file.exists())
+            
+            # Verify content
+            with open(config_file, 'r') as f:
+                saved_config = json.load(f)
             
-            with patch.object(Config, '_get_user_config_path', return_value=config_file):
-                self.config.set('test_setting', 'test_value')
-                self.config.save_user_config()
-                
-                # Verify file was created
-                self.assertTrue(config_file.exists())
-                
-                # Verify content
-                with open(config_file, 'r') as f:
-                    saved_config = json.load(f)
-                
-                self.assertEqual(saved_config['test_setting'], 'test_value')
+            self.assertEqual(saved_config['test_setting'], 'test_value')
 
 
 if __name__ == '__main__':
@@ -3,6 +3,7 @@ Tests for error handling and validation.
 """
 
 import unittest
+import json
 import logging
 from unittest.mock import patch, MagicMock
 from code_summarizer.parser import DiffParser
@@ -220,7 +221,6 @@ class TestErrorHandling(unittest.TestCase):
         self.assertIsInstance(result, str)
         
         # Should be valid JSON
-        import json
         data = json.loads(result)
         self.assertIsInstance(data, dict)
     
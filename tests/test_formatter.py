@@ -2,8 +2,10 @@
 Tests for output formatter.
 """
 
+import io
 import json
 import unittest
+from unittest.mock import patch
 from code_summarizer.formatter import OutputFormatter
 from code_summarizer.models import Summary, FileSummary, ChangeStatistics
 
@@ -79,6 +81,37 @@ class TestOutputFormatter(unittest.TestCase):
         self.assertEqual(len(data['key_changes']), 2)
         self.assertEqual(len(data['recommendations']), 2)
     
+    def test_format_json_round_trips(self):
+        """Test that JSON output parses back to the summary, with or without orjson."""
+        summary = Summary(
+            overview='Quotes " and \\ backslashes, caf\u00e9\nand a newline',
+            file_summaries=[
+                FileSummary(filename='a.py', summary='Tab\there', key_changes=[]),
+                FileSummary(filename='b.py', summary='', key_changes=['\x00 control', '\u2028 separator']),
+            ],
+            statistics=ChangeStatistics(total_files=2, files_modified=2, total_lines_added=3),
+            key_changes=[],
+            recommendations=['\U0001f600'],
+        )
+        expected = {
+            'overview': summary.overview,
+            'statistics': {
+                'total_files': 2, 'files_added': 0, 'files_modified': 2, 'files_deleted': 0,
+                'total_lines_added': 3, 'total_lines_removed': 0,
+            },
+            'file_summaries': [
+                {'filename': fs.filename, 'summary': fs.summary, 'key_changes': fs.key_changes}
+                for fs in summary.file_summaries
+            ],
+            'key_changes': [],
+            'recommendations': summary.recommendations,
+        }
+        
+        self.assertEqual(json.loads(self.formatter.format_output(summary, 'json')), expected)
+        with patch('code_summarizer.formatter.orjson', None):
+            result = self.formatter.format_output(summary, 'json')
+        self.assertEqual(result, json.dumps(expected, indent=2, ensure_ascii=False))
+    
     def test_format_markdown(self):
         """Test Markdown formatting."""
         result = self.formatter.format_output(self.sample_summary, 'markdown')
@@ -153,6 +186,15 @@ class TestOutputFormatter(unittest.TestCase):
         text_result = self.formatter.format_output(self.sample_summary, 'text')
         self.assertEqual(plain_result, text_result)
     
+    def test_format_output_to_stream(self):
+        """Test that writing to a stream produces the same text as returning it."""
+        for format_type in ('json', 'markdown', 'plain'):
+            out = io.StringIO()
+            result = self.formatter.format_output(self.sample_summary, format_type, out=out)
+            
+            self.assertIsNone(result)
+            self.assertEqual(out.getvalue(), self.formatter.format_output(self.sample_summary, format_type))
+    
     def test_unsupported_format(self):
         """Test error handling for unsupported format."""
         with self.assertRaises(ValueError) as context:
@@ -196,6 +238,14 @@ File Summaries:
         self.assertIn('- new_feature.py:', result)
         self.assertIn('- existing.py:', result)
     
+    def test_apply_template_computes_only_referenced_variables(self):
+        """Test that unused template variables are not computed."""
+        with patch.object(self.formatter, '_format_file_summaries_for_template') as mock_file_summaries:
+            result = self.formatter.apply_template(self.sample_summary, "{total_files:>3} files: {overview}")
+        
+        mock_file_summaries.assert_not_called()
+        self.assertEqual(result, f"  2 files: {self.sample_summary.overview}")
+    
     def test_apply_template_missing_variable(self):
         """Test template application with missing variable."""
         template = "Unknown variable: {unknown_var}"
@@ -196,6 +196,23 @@ class TestSummaryGenerator(unittest.TestCase):
         self.assertIn('added function new_endpoint', description)
         self.assertIn('modified class APIHandler', description)
     
+    def test_create_change_description_renamed_removals_only(self):
+        """Test the exact description for a rename with only removed lines."""
+        file_change = FileChange(filename='new.py', change_type='renamed', old_filename='old.py')
+        file_change.lines_removed = 4
+        
+        analyzed_change = AnalyzedChange(
+            file_change=file_change,
+            structural_changes=[],
+            purpose_inference='Code modification',
+            impact_assessment='Small-scale changes - low impact',
+            complexity_score=1
+        )
+        
+        description = self.generator.create_change_description(analyzed_change)
+        
+        self.assertEqual(description, "Renamed 'old.py' to 'new.py' - (-4 lines)")
+    
     def test_identify_key_changes_high_complexity(self):
         """Test identifying high complexity changes as key changes."""
         file_change = FileChange(filename='complex.py', change_type='modified')
@@ -217,6 +234,22 @@ class TestSummaryGenerator(unittest.TestCase):
         self.assertIn('High complexity change', key_changes_text)
         self.assertIn('Large change', key_changes_text)
     
+    def test_identify_key_changes_priority_and_limit(self):
+        """Test that key changes keep category order and stop at ten entries."""
+        changes = []
+        for index in range(8):
+            file_change = FileChange(filename=f'complex{index}.py', change_type='modified')
+            changes.append(AnalyzedChange(file_change=file_change, structural_changes=[], complexity_score=8))
+        for index in range(5):
+            file_change = FileChange(filename=f'gone{index}.py', change_type='deleted')
+            changes.append(AnalyzedChange(file_change=file_change, structural_changes=[], complexity_score=1))
+        
+        key_changes = self.generator._identify_key_changes(self.generator._aggregate(changes))
+        
+        self.assertEqual(len(key_changes), 10)
+        self.assertEqual(key_changes[7], 'High complexity change in complex7.py')
+        self.assertEqual(key_changes[8:], ['Deleted file: gone0.py', 'Deleted file: gone1.py'])
+    
     def test_generate_recommendations_high_complexity(self):
         """Test generating recommendations for high complexity changes."""
         file_change = FileChange(filename='complex.py', change_type='modified')
@@ -255,6 +288,29 @@ class TestSummaryGenerator(unittest.TestCase):
         recommendations_text = ' '.join(summary.recommendations)
         self.assertIn('adding tests', recommendations_text)
     
+    def test_generate_recommendations_test_coverage_ratio(self):
+        """Test the test coverage threshold of more than two source files per test file."""
+        def changes(filenames):
+            return [
+                AnalyzedChange(
+                    file_change=FileChange(filename=filename, change_type='modified'),
+                    structural_changes=[]
+                )
+                for filename in filenames
+            ]
+        
+        balanced = changes(['tests/test_a.py', 'b.spec.js', 'a.py', 'b.py', 'c.py', 'd.py'])
+        unbalanced = balanced + changes(['e.py'])
+        
+        self.assertNotIn(
+            "Consider adding tests for the new functionality",
+            self.generator._generate_recommendations(self.generator._aggregate(balanced))
+        )
+        self.assertIn(
+            "Consider adding tests for the new functionality",
+            self.generator._generate_recommendations(self.generator._aggregate(unbalanced))
+        )
+    
     def test_generate_recommendations_documentation(self):
         """Test generating documentation recommendations."""
         file_change = FileChange(filename='new_feature.py', change_type='added')
@@ -273,6 +329,21 @@ class TestSummaryGenerator(unittest.TestCase):
         recommendations_text = ' '.join(summary.recommendations)
         self.assertIn('documentation', recommendations_text)
     
+    def test_generate_recommendations_documentation_in_later_file(self):
+        """Test that documentation changes anywhere in the diff satisfy new features."""
+        changes = [
+            AnalyzedChange(
+                file_change=FileChange(filename=f'file_{index}.py', change_type='modified'),
+                structural_changes=[],
+                purpose_inference=purpose
+            )
+            for index, purpose in enumerate(['Feature addition', 'Feature addition', 'Documentation update'])
+        ]
+        
+        recommendations = self.generator._generate_recommendations(self.generator._aggregate(changes))
+        
+        self.assertNotIn("Consider updating documentation for new features", recommendations)
+    
     def test_generate_recommendations_api_changes(self):
         """Test generating API change recommendations."""
         file_change = FileChange(filename='api.py', change_type='modified')
@@ -313,6 +384,48 @@ class TestSummaryGenerator(unittest.TestCase):
         self.assertIn('Large-scale changes', recommendations_text)
         self.assertIn('smaller commits', recommendations_text)
     
+    def test_aggregate_collects_findings_in_one_pass(self):
+        """Test that aggregation gathers statistics and per-file findings together."""
+        added = FileChange(filename='new_module.py', change_type='added')
+        added.lines_added = 120
+        modified = FileChange(filename='tests/test_module.py', change_type='modified')
+        modified.lines_added = 3
+        modified.lines_removed = 1
+        
+        changes = [
+            AnalyzedChange(
+                file_change=added,
+                structural_changes=[StructuralChange(
+                    change_type='import_added', element_name='os', description='Added import os'
+                )],
+                purpose_inference='Feature addition; Testing',
+                impact_assessment='Public API changes',
+                complexity_score=8
+            ),
+            AnalyzedChange(
+                file_change=modified,
+                structural_changes=[],
+                purpose_inference='Testing',
+                impact_assessment='Small-scale changes - low impact',
+                complexity_score=1
+            ),
+        ]
+        
+        aggregate = self.generator._aggregate(changes)
+        
+        self.assertEqual(aggregate.statistics.total_files, 2)
+        self.assertEqual(aggregate.statistics.files_added, 1)
+        self.assertEqual(aggregate.statistics.total_lines_removed, 1)
+        self.assertEqual(aggregate.purpose_counts.most_common(1), [('Testing', 2)])
+        self.assertEqual(aggregate.high_complexity, ['new_module.py'])
+        self.assertEqual(aggregate.large_changes, [('new_module.py', 120)])
+        self.assertEqual(aggregate.test_file_count, 1)
+        self.assertEqual(aggregate.total_lines_changed, 124)
+        self.assertTrue(aggregate.has_new_features)
+        self.assertTrue(aggregate.has_api_changes)
+        self.assertTrue(aggregate.has_dependency_changes)
+        self.assertFalse(aggregate.has_doc_changes)
+    
     def test_describe_structural_changes_mixed(self):
         """Test describing mixed structural changes."""
         structural_changes = [
@@ -344,6 +457,58 @@ class TestSummaryGenerator(unittest.TestCase):
         self.assertIn('modified class MyClass', description)
         self.assertIn('removed function old_func', description)
     
+    def test_describe_structural_changes_keeps_type_order(self):
+        """Test that types appear in first-seen order, including unrecognised actions."""
+        structural_changes = [
+            StructuralChange(change_type='class', element_name='Base', description='Class'),
+            StructuralChange(change_type='function_added', element_name='helper', description='Added'),
+            StructuralChange(change_type='class_modified', element_name='Base', description='Modified'),
+            StructuralChange(change_type='class_modified', element_name='Other', description='Modified'),
+            StructuralChange(change_type='method_renamed', element_name='run', description='Renamed'),
+        ]
+        
+        description = self.generator._describe_structural_changes(structural_changes)
+        
+        self.assertEqual(description, 'modified 2 classs; added function helper')
+    
+    def test_file_summary_structural_key_changes(self):
+        """Test key change wording for each structural action."""
+        file_change = FileChange(filename='app.py', change_type='modified')
+        analyzed_change = AnalyzedChange(
+            file_change=file_change,
+            structural_changes=[
+                StructuralChange(change_type='function_added', element_name='run', description=''),
+                StructuralChange(change_type='class_removed', element_name='Old', description=''),
+                StructuralChange(change_type='import_modified', element_name='os', description=''),
+                StructuralChange(change_type='method_renamed', element_name='go', description=''),
+            ],
+            complexity_score=1
+        )
+        
+        file_summary = self.generator._create_file_summary(analyzed_change)
+        
+        self.assertEqual(file_summary.key_changes, [
+            "Added function 'run'", "Removed class 'Old'", "Modified import 'os'"
+        ])
+    
+    def test_describe_structural_changes_reuses_footprints(self):
+        """Test that repeated structural footprints are described from the cache."""
+        from code_summarizer.generator import _describe_footprint
+        
+        def footprint():
+            return [
+                StructuralChange(change_type='function_added', element_name='setup', description=''),
+                StructuralChange(change_type='function_added', element_name='teardown', description=''),
+            ]
+        
+        first = self.generator._describe_structural_changes(footprint())
+        hits = _describe_footprint.cache_info().hits
+        second = self.generator._describe_structural_changes(footprint())
+        
+        self.assertEqual(first, 'added 2 functions')
+        self.assertEqual(second, first)
+        self.assertEqual(_describe_footprint.cache_info().hits, hits + 1)
+    
     def test_file_summary_complexity_indicators(self):
         """Test file summary includes complexity indicators."""
         file_change = FileChange(filename='complex.py', change_type='modified')
@@ -385,6 +550,22 @@ class TestSummaryGenerator(unittest.TestCase):
         
         self.assertIn('Primary focus: Bug fix or enhancement', summary.overview)
 
+    
+    def test_overview_primary_focus_ranking(self):
+        """Test that primary focus ranks purposes by count, keeping first-seen order on ties."""
+        purposes = ['Testing; Refactoring', 'Bug fix; Testing', 'Documentation; Bug fix', 'Styling']
+        changes = [
+            AnalyzedChange(
+                file_change=FileChange(filename=f'file_{index}.py', change_type='modified'),
+                structural_changes=[],
+                purpose_inference=purpose
+            )
+            for index, purpose in enumerate(purposes)
+        ]
+        
+        summary = self.generator.generate_summary(changes)
+        
+        self.assertTrue(summary.overview.endswith('Primary focus: Testing, Bug fix, Refactoring.'))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -647,7 +647,7 @@ index 1234567..abcdefg 100644
         """Test CLI with configuration-related options."""
         # Test create config option
         with patch('sys.argv', ['cli.py', '--create-config']):
-            with patch('code_summarizer.config.config.create_sample_config') as mock_create:
+            with patch('code_summarizer.config.Config.create_sample_config') as mock_create:
                 result = main()
                 self.assertEqual(result, 0)
                 mock_create.assert_called_once()
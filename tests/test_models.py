@@ -3,6 +3,7 @@ Tests for data models.
 """
 
 import unittest
+from dataclasses import dataclass, field
 from code_summarizer.models import (
     DiffLine, Hunk, FileChange, StructuralChange, 
     AnalyzedChange, Summary, ChangeStatistics, FileSummary
@@ -34,6 +35,77 @@ class TestModels(unittest.TestCase):
         self.assertEqual(len(summary.file_summaries), 0)
         self.assertEqual(len(summary.key_changes), 0)
         self.assertIsInstance(summary.statistics, ChangeStatistics)
+    
+    def test_models_use_slots(self):
+        """Test that every model instance carries no per-instance __dict__."""
+        diff_line = DiffLine(line_type='+', content='x = 1')
+        hunk = Hunk(old_start=1, old_count=0, new_start=1, new_count=1, lines=[diff_line])
+        structural_change = StructuralChange(change_type='function_added', element_name='f', description='Added')
+        file_change = FileChange(filename='test.py', change_type='modified', hunks=[hunk])
+        analyzed_change = AnalyzedChange(file_change=file_change, structural_changes=[structural_change])
+        file_summary = FileSummary(filename='test.py', summary='Modified', key_changes=[])
+        summary = Summary(overview='Test changes', file_summaries=[file_summary])
+        for instance in (diff_line, hunk, structural_change, file_change, analyzed_change,
+                         file_summary, summary, summary.statistics):
+            self.assertFalse(hasattr(instance, '__dict__'))
+    
+    def test_add_slots_backport(self):
+        """Test the pre-3.10 slots backport on a dataclass with defaults and derived fields."""
+        from code_summarizer.models import _add_slots
+        
+        @dataclass
+        class Sample:
+            name: str
+            tags: list = field(default_factory=list)
+            count: int = 0
+            upper: str = field(init=False, repr=False, compare=False)
+            
+            def __post_init__(self):
+                self.upper = self.name.upper()
+        
+        Slotted = _add_slots(Sample)
+        sample = Slotted('a')
+        
+        self.assertFalse(hasattr(sample, '__dict__'))
+        self.assertEqual((sample.tags, sample.count, sample.upper), ([], 0, 'A'))
+        self.assertEqual(sample, Slotted('a'))
+        self.assertIsNot(sample.tags, Slotted('a').tags)
+        with self.assertRaises(AttributeError):
+            sample.extra = 1
+        
+        @dataclass
+        class PlainDerivedDefault:
+            cached: int = field(default=0, init=False)
+        
+        with self.assertRaises(TypeError):
+            _add_slots(PlainDerivedDefault)
+    
+    def test_default_lists_are_not_shared(self):
+        """Test that list defaults are fresh per instance and None is still accepted."""
+        first = FileChange(filename='a.py', change_type='modified')
+        second = FileChange(filename='b.py', change_type='modified')
+        first.hunks.append(Hunk(old_start=1, old_count=0, new_start=1, new_count=0, lines=[]))
+        self.assertEqual(second.hunks, [])
+        
+        summary = Summary(overview='Test changes', key_changes=None, statistics=None)
+        self.assertEqual(summary.key_changes, [])
+        self.assertIsInstance(summary.statistics, ChangeStatistics)
+    
+    def test_file_change_accepts_none_hunks(self):
+        """Test that FileChange turns hunks=None into an empty list that analysis accepts."""
+        from code_summarizer.analyzer import CodeAnalyzer
+        file_change = FileChange(filename='test.py', change_type='modified', hunks=None)
+        self.assertEqual(file_change.hunks, [])
+        
+        analyzed = CodeAnalyzer().analyze_changes([file_change])[0]
+        self.assertNotEqual(analyzed.purpose_inference, "Analysis failed")
+    
+    def test_structural_change_privacy(self):
+        """Test that StructuralChange derives is_private from the element name."""
+        private = StructuralChange(change_type='function_added', element_name='_helper', description='Added')
+        public = StructuralChange(change_type='function_added', element_name='helper', description='Added')
+        self.assertTrue(private.is_private)
+        self.assertFalse(public.is_private)
 
 
 if __name__ == '__main__':
@@ -185,6 +185,103 @@ index 1234567..abcdefg 100644
         self.assertEqual(hunk2.new_start, 11)
         self.assertEqual(len(hunk2.lines), 4)  # includes empty line
     
+    def test_hunk_line_numbering(self):
+        """Test line types, content and numbering for each kind of hunk line."""
+        lines = [
+            '@@ -10,3 +20,3 @@',
+            ' same',
+            '-old',
+            '+new',
+            '\\ No newline at end of file',
+        ]
+        hunk, lines_processed = self.parser._parse_hunk(lines)
+        
+        self.assertEqual(lines_processed, 5)
+        self.assertEqual(
+            [(l.line_type, l.content, l.line_number) for l in hunk.lines],
+            [(' ', 'same', 10), ('-', 'old', 11), ('+', 'new', 21),
+             (' ', '\\ No newline at end of file', 12)]
+        )
+    
+    def test_hunk_tallies_added_and_removed_lines(self):
+        """Test that hunks carry their own added/removed counts and files sum them."""
+        diff_text = """diff --git a/app.py b/app.py
+--- a/app.py
++++ b/app.py
+@@ -1,3 +1,4 @@
+ keep
+-drop
++add one
++add two
+@@ -20,2 +21,1 @@
+-gone
+ tail"""
+        file_change = self.parser.parse_diff(diff_text)[0]
+        
+        self.assertEqual([(h.lines_added, h.lines_removed) for h in file_change.hunks], [(2, 1), (0, 1)])
+        self.assertEqual(file_change.lines_added, 2)
+        self.assertEqual(file_change.lines_removed, 2)
+    
+    def test_hunk_lines_share_line_type_constants(self):
+        """Test that parsed diff lines use the DiffLine line type constants."""
+        hunk, _ = self.parser._parse_hunk(['@@ -1,2 +1,2 @@', '-old', '+new', ' same'])
+        
+        self.assertIs(hunk.lines[0].line_type, DiffLine.REMOVED)
+        self.assertIs(hunk.lines[1].line_type, DiffLine.ADDED)
+        self.assertIs(hunk.lines[2].line_type, DiffLine.CONTEXT)
+    
+    def test_files_share_change_type_and_language_strings(self):
+        """Test that repeated change types and languages are one shared object each."""
+        from code_summarizer.analyzer import CodeAnalyzer
+        diff_text = "".join(
+            f"diff --git a/{name}.py b/{name}.py\n--- a/{name}.py\n+++ b/{name}.py\n@@ -1 +1 @@\n-a\n+b\n"
+            for name in ('first', 'second')
+        )
+        first, second = self.parser.parse_diff(diff_text)
+        
+        self.assertIs(first.change_type, second.change_type)
+        analyzed = CodeAnalyzer().analyze_changes([first, second])
+        self.assertIs(analyzed[0].file_change.language, analyzed[1].file_change.language)
+    
+    def test_parse_hunk_stream_returns_next_line(self):
+        """Test that streaming hunk parsing hands back the line that ended the hunk."""
+        remaining = iter(['+added', ' kept', '@@ -9 +9 @@', '+later'])
+        
+        hunk, next_line = self.parser._parse_hunk_stream('@@ -1,1 +1,2 @@', remaining)
+        
+        self.assertEqual(len(hunk.lines), 2)
+        self.assertEqual(next_line, '@@ -9 +9 @@')
+        self.assertEqual(list(remaining), ['+later'])
+        
+        hunk, next_line = self.parser._parse_hunk_stream('@@ -9 +9 @@', remaining)
+        self.assertEqual(hunk.lines_added, 0)
+        self.assertIsNone(next_line)
+    
+    def test_metadata_lines_are_classified(self):
+        """Test file metadata handling, including unrecognised lines, with shared patterns."""
+        diff_text = """diff --git a/old.py b/new.py
+similarity index 90%
+rename from old.py
+rename to new.py
+index 123..456 100644
+--- a/old.py
++++ b/new.py"""
+        file_change = self.parser.parse_diff(diff_text)[0]
+        
+        self.assertEqual(file_change.change_type, 'renamed')
+        self.assertEqual(file_change.old_filename, 'old.py')
+        self.assertEqual(file_change.filename, 'new.py')
+        self.assertEqual(file_change.hunks, [])
+        self.assertIs(self.parser.metadata_pattern, DiffParser().metadata_pattern)
+    
+    def test_validate_plain_unified_diff(self):
+        """Test validation of diffs without a git header."""
+        unified = "--- a/x.py\n+++ b/x.py\n@@ -1 +1 @@\n-a\n+b"
+        
+        self.assertTrue(self.parser.validate_diff_format(unified))
+        self.assertFalse(self.parser.validate_diff_format("--- a/x.py\n+++ b/x.py"))
+        self.assertFalse(self.parser.validate_diff_format("@@ -1 +1 @@\n+++ only"))
+    
     def test_empty_diff(self):
         """Test parsing empty diff."""
         file_changes = self.parser.parse_diff("")
@@ -193,6 +290,13 @@ index 1234567..abcdefg 100644
         file_changes = self.parser.parse_diff("   \n  \n  ")
         self.assertEqual(len(file_changes), 0)
 
+    
+    def test_whitespace_only_input(self):
+        """Test that any whitespace-only input is treated as empty."""
+        for text in ("\n\t\r\n", "\u2003\x0b\x0c "):
+            self.assertEqual(self.parser.parse_diff(text), [])
+            self.assertEqual(self.parser.extract_hunks(text), [])
+            self.assertFalse(self.parser.validate_diff_format(text))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file